@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+from array import array
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
-from pydantic import BaseModel, Field, HttpUrl, constr
+from pydantic import BaseModel, Field, HttpUrl, PrivateAttr, computed_field, constr
 
 
 class IngestionStatus(str, Enum):
@@ -61,6 +62,43 @@ class IngestionEvent(BaseModel):
     data: Dict[str, Any] = Field(default_factory=dict)
 
 
+class EventLog:
+    """
+    Append-only event storage laid out as parallel arrays (struct-of-arrays).
+    Timestamps live in a packed array('d'); IngestionEvent envelopes are only
+    built when events are read.
+    """
+
+    __slots__ = ("types", "messages", "tss", "datas")
+
+    def __init__(self) -> None:
+        self.types: List[str] = []
+        self.messages: List[str] = []
+        self.tss = array("d")
+        self.datas: List[Optional[Dict[str, Any]]] = []
+
+    def append(self, type_: str, message: str, ts: float, data: Optional[Dict[str, Any]] = None) -> None:
+        self.types.append(type_)
+        self.messages.append(message)
+        self.tss.append(ts)
+        self.datas.append(data)
+
+    def copy(self) -> "EventLog":
+        log = EventLog()
+        log.types = list(self.types)
+        log.messages = list(self.messages)
+        log.tss = array("d", self.tss)
+        log.datas = list(self.datas)
+        return log
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def __iter__(self) -> Iterator[IngestionEvent]:
+        for type_, message, ts, data in zip(self.types, self.messages, self.tss, self.datas):
+            yield IngestionEvent.model_construct(type=type_, message=message, ts=ts, data=data or {})
+
+
 class IngestionJob(BaseModel):
     id: str
     tenant_id: str
@@ -69,7 +107,24 @@ class IngestionJob(BaseModel):
     updated_at: float
     items: List[IngestionItem] = Field(default_factory=list)
     index_job_id: Optional[str] = None
-    events: List[IngestionEvent] = Field(default_factory=list)
+
+    _event_log: EventLog = PrivateAttr(default_factory=EventLog)
+
+    def __copy__(self) -> "IngestionJob":
+        # model_copy() shallow-copies private attrs; give the copy its own log
+        # so appending to one job never shows up in the other.
+        copied = super().__copy__()
+        copied._event_log = self._event_log.copy()
+        return copied
+
+    @property
+    def event_log(self) -> EventLog:
+        return self._event_log
+
+    @computed_field  # type: ignore[misc]
+    @property
+    def events(self) -> List[IngestionEvent]:
+        return list(self._event_log)
 
 
 class CreateIngestionResponse(BaseModel):
@@ -59,6 +59,8 @@ def get_service(auth: _AuthCtx = Depends(get_auth_ctx)) -> IngestionService:
 router = APIRouter(prefix="/ingestions", tags=["ingestions"])
 
 
+# Keep these handlers sync (`def`): FastAPI runs them in its threadpool, so the
+# blocking blob/metadata/indexer calls in create_ingestion never run on the event loop.
 @router.post("", response_model=CreateIngestionResponse, status_code=status.HTTP_201_CREATED)
 def create_ingestion(req: CreateIngestionRequest, svc: IngestionService = Depends(get_service)):
     try:
@@ -3,7 +3,7 @@ from __future__ import annotations
 import threading
 import time
 import uuid
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
 from .contracts import IngestionEvent, IngestionJob, IngestionStatus
 
@@ -12,6 +12,9 @@ class InMemoryIngestionRepo:
     """
     Per-tenant in-memory store for jobs + events.
     Not thread-safe across processes; adequate for tests + first iteration.
+    Within a process the repo is shared by threadpool workers: the RLock guards
+    the job map and event appends, while a job's own fields are only mutated by
+    the request thread that created it.
     """
 
     def __init__(self) -> None:
@@ -21,10 +24,11 @@ class InMemoryIngestionRepo:
     def _now(self) -> float:
         return time.time()
 
-    def create_job(self, tenant_id: str) -> IngestionJob:
+    def create_job(self, tenant_id: str, ts: Optional[float] = None) -> IngestionJob:
         with self._lock:
             job_id = str(uuid.uuid4())
-            ts = self._now()
+            if ts is None:
+                ts = self._now()
             job = IngestionJob(
                 id=job_id,
                 tenant_id=tenant_id,
@@ -32,7 +36,6 @@ class InMemoryIngestionRepo:
                 created_at=ts,
                 updated_at=ts,
                 items=[],
-                events=[],
             )
             self._jobs[job_id] = job
             return job
@@ -44,19 +47,22 @@ class InMemoryIngestionRepo:
                 return job
             return None
 
-    def save_job(self, job: IngestionJob) -> None:
+    def append_event(
+        self,
+        job: IngestionJob,
+        type_: str,
+        message: str,
+        data: Optional[Dict[str, Any]] = None,
+        ts: Optional[float] = None,
+    ) -> None:
         with self._lock:
-            job.updated_at = self._now()
-            self._jobs[job.id] = job
-
-    def append_event(self, job: IngestionJob, event: IngestionEvent) -> None:
-        with self._lock:
-            job.events.append(event)
-            job.updated_at = self._now()
-            self._jobs[job.id] = job
+            if ts is None:
+                ts = self._now()
+            job.event_log.append(type_, message, ts, data)
+            job.updated_at = ts
 
     def list_events(self, tenant_id: str, job_id: str) -> List[IngestionEvent]:
         job = self.get_job(tenant_id, job_id)
-        return list(job.events) if job else []
+        return list(job.event_log) if job else []
 
 
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import enum
+import sys
 from typing import Any, Dict, Iterable, List, Literal, Optional, AsyncIterator, Union
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, field_validator
 
 
 # ===== Errors (domain) =====
@@ -63,7 +64,14 @@ class PromptMessage(BaseModel):
     # For tool message replies we can thread by tool_call_id if needed
     tool_call_id: Optional[str] = None
 
-    @validator("content")
+    @field_validator("role", "name", "tool_call_id", mode="before")
+    @classmethod
+    def intern_small_strings(cls, v: Any) -> Any:
+        # Roles and tool/name ids repeat across long histories; share one str object.
+        return sys.intern(v) if isinstance(v, str) else v
+
+    @field_validator("content")
+    @classmethod
     def content_not_empty(cls, v: str) -> str:
         if not isinstance(v, str) or not v.strip():
             raise ValueError("content must be a non-empty string")
@@ -71,6 +79,8 @@ class PromptMessage(BaseModel):
 
 
 class ChatRequest(BaseModel):
+    # Validated once at the HTTP boundary; internal passes use model_copy /
+    # model_construct, which do not validate.
     model: str = Field(..., description="Provider-specific model name")
     messages: List[PromptMessage]
     temperature: Optional[float] = Field(default=0.2, ge=0.0, le=2.0)
@@ -81,7 +91,8 @@ class ChatRequest(BaseModel):
     tool_choice: Optional[Literal["auto", "none"]] = "none"
     metadata: Dict[str, Any] = Field(default_factory=dict)  # tracing, tenant, etc.
 
-    @validator("messages")
+    @field_validator("messages")
+    @classmethod
     def at_least_one_message(cls, v: List[PromptMessage]) -> List[PromptMessage]:
         if not v:
             raise ValueError("messages must contain at least one message")
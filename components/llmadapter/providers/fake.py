@@ -5,6 +5,11 @@ import hashlib
 import time
 from typing import AsyncIterator, List
 
+try:
+    import blake3  # type: ignore
+except Exception:  # pragma: no cover
+    blake3 = None  # type: ignore
+
 from ..contracts import (
     ChatDelta,
     ChatRequest,
@@ -74,11 +79,12 @@ def _last_user_content(req: ChatRequest) -> str:
 
 
 def _rid(req: ChatRequest) -> str:
-    h = hashlib.sha1()
-    h.update(req.model.encode("utf-8"))
-    last = _last_user_content(req).encode("utf-8")
-    h.update(last)
-    return "fake_" + h.hexdigest()[:16]
+    # NUL-separated so ("ab", "c") and ("a", "bc") differ; both branches hash it.
+    data = req.model.encode("utf-8") + b"\x00" + _last_user_content(req).encode("utf-8")
+    if blake3 is not None:
+        # SIMD-parallel hash; an 8-byte digest yields the same 16 hex chars
+        return "fake_" + blake3.blake3(data).hexdigest(length=8)
+    return "fake_" + hashlib.sha1(data).hexdigest()[:16]
 
 
 def _fake_usage(req: ChatRequest, completion: str) -> Usage:
@@ -13,12 +13,21 @@ from .service import LLMAdapterService
 
 router = APIRouter(prefix="/v1/llm", tags=["llm"])
 
+_CHUNK_SUFFIX = b'", "event": "chunk"}\n'
+
 
 def get_service() -> LLMAdapterService:
     return LLMAdapterService()
 
 
-@router.post("/chat", response_model=ChatResponse)
+# response_model=None: the service already returns a validated ChatResponse, so
+# skip FastAPI's second validation pass and serialize it directly (same payload,
+# nulls included, as response_model=ChatResponse would produce).
+@router.post(
+    "/chat",
+    response_model=None,
+    responses={200: {"model": ChatResponse}},
+)
 async def chat(
     req: ChatRequest,
     service: LLMAdapterService = Depends(get_service),
@@ -27,7 +36,8 @@ async def chat(
     # Propagate request id if provided
     if x_request_id:
         req.metadata = {**(req.metadata or {}), "request_id": x_request_id}
-    return await service.chat(req)
+    resp = await service.chat(req)
+    return Response(resp.model_dump_json(), media_type="application/json")
 
 
 @router.post("/chat/stream")
@@ -40,8 +50,28 @@ async def chat_stream(
         req.metadata = {**(req.metadata or {}), "request_id": x_request_id}
 
     async def ndjson() -> AsyncIterator[bytes]:
+        # id/model are constant within a stream: encode the frame head once and
+        # splice each content_delta into it. Other frame shapes take the full path.
+        head_key = None
+        head = b""
         async for delta in service.chat_stream(req):
-            yield (json.dumps(delta.dict(exclude_none=True)) + "\n").encode("utf-8")
+            if (
+                delta.content_delta is not None
+                and delta.event == "chunk"
+                and delta.tool_calls_delta is None
+                and delta.usage is None
+                and delta.id is not None
+                and delta.model is not None
+            ):
+                if head_key != (delta.id, delta.model):
+                    head_key = (delta.id, delta.model)
+                    # '{"id": .., "model": .., "content_delta": ""}' minus the closing '"}'
+                    head = json.dumps(
+                        {"id": delta.id, "model": delta.model, "content_delta": ""}
+                    )[:-2].encode("utf-8")
+                yield head + json.dumps(delta.content_delta)[1:-1].encode("utf-8") + _CHUNK_SUFFIX
+                continue
+            yield (json.dumps(delta.model_dump(exclude_none=True)) + "\n").encode("utf-8")
 
     # Using text/plain NDJSON for simplicity; can switch to text/event-stream later
     return StreamingResponse(ndjson(), media_type="text/plain; charset=utf-8")
@@ -55,7 +55,7 @@ class LLMAdapterService:
         md = dict(req.metadata or {})
         md.setdefault("request_id", md.get("request_id") or str(uuid.uuid4()))
         md.setdefault("span_id", md.get("span_id") or str(uuid.uuid4()))
-        # shallow copy with updated metadata
-        return ChatRequest(**{**req.dict(exclude={"metadata"}), "metadata": md})
+        # shallow copy with updated metadata; req was already validated at the boundary
+        return req.model_copy(update={"metadata": md})
 
 
@@ -8,7 +8,3 @@ from .contracts import (
     Stats,
     ErrorEnvelope,
 )
-
----
-
-```python
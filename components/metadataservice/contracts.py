@@ -124,6 +124,15 @@ class LLMAdapterPort(Protocol):
         ...
 
 
+@runtime_checkable
+class FusedLLMAdapterPort(Protocol):
+    """Optional extension of LLMAdapterPort: summary + categories in one round trip."""
+    def extract_summary_and_categories(
+        self, text: str, tenant_id: str, max_labels: int = 5
+    ) -> Tuple[str, List[str]]:
+        ...
+
+
 @runtime_checkable
 class MetadataStorePort(Protocol):
     def upsert(self, record: MetadataRecord) -> None:
@@ -132,6 +141,15 @@ class MetadataStorePort(Protocol):
         ...
 
 
+@runtime_checkable
+class ResultCachePort(Protocol):
+    """Content-addressable cache of extracted records (see service.PROMPT_VERSION)."""
+    def get(self, key: Tuple[Any, ...]) -> Optional[MetadataRecord]:
+        ...
+    def put(self, key: Tuple[Any, ...], record: MetadataRecord) -> None:
+        ...
+
+
 @runtime_checkable
 class KeywordExtractorPort(Protocol):
     def top_keywords(self, text: str, top_k: int = 10, language_hint: Optional[str] = None) -> List[str]:
@@ -168,8 +186,3 @@ class LLMFailedError(MetadataError):
 class StoreFailedError(MetadataError):
     code = "metadata.store_failed"
     status = 500
-````
-
----
-
-```python
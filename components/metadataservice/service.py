@@ -7,15 +7,18 @@ Project: lbp3-rs
 from __future__ import annotations
 
 import hashlib
+import heapq
 import logging
 import re
+import threading
 import uuid
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 
 from fastapi import APIRouter, Depends, FastAPI, HTTPException, status
 from fastapi import Response
-from pydantic import BaseModel
 
 from .contracts import (
     BlobNotFoundError,
@@ -25,12 +28,14 @@ from .contracts import (
     ExtractRequest,
     ExtractResponse,
     ExtractTextInput,
+    FusedLLMAdapterPort,
     InvalidInputError,
     KeywordExtractorPort,
     LLMAdapterPort,
     LLMFailedError,
     MetadataRecord,
     MetadataStorePort,
+    ResultCachePort,
     Stats,
     StoreFailedError,
 )
@@ -40,6 +45,14 @@ logger = logging.getLogger("lbp3.metadataservice")
 logger.setLevel(logging.INFO)
 
 
+# Bump when summarize/categorize prompts change so cached LLM output is not reused.
+PROMPT_VERSION = "v1"
+
+_TOKEN_RE = re.compile(r"[A-Za-z0-9']{2,}")
+# Same boundaries str.splitlines() uses
+_LINE_BREAK_RE = re.compile("[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]")
+
+
 def _try_span(name: str):
     """Context manager that starts a noop span if otel not available."""
     class _Noop:
@@ -78,14 +91,12 @@ class SimpleKeywordExtractor(KeywordExtractorPort):
     def top_keywords(self, text: str, top_k: int = 10, language_hint: Optional[str] = None) -> List[str]:
         lang = language_hint or "en"
         stop = self._STOPWORDS.get(lang, set())
-        tokens = re.findall(r"[A-Za-z0-9']{2,}", text.lower())
-        freq: Dict[str, int] = {}
-        for t in tokens:
-            if t in stop or t.isdigit():
-                continue
-            freq[t] = freq.get(t, 0) + 1
-        sorted_tokens = sorted(freq.items(), key=lambda kv: (-kv[1], kv[0]))
-        return [w for w, _ in sorted_tokens[: max(1, top_k)]]
+        tokens = _TOKEN_RE.findall(text.lower())
+        freq = Counter(t for t in tokens if t not in stop and not t.isdigit())
+        # Partial O(n log k) selection. Counter.most_common breaks ties by insertion
+        # order; nsmallest keeps the (count desc, word asc) order deterministic.
+        top = heapq.nsmallest(max(1, top_k), freq.items(), key=lambda kv: (-kv[1], kv[0]))
+        return [w for w, _ in top]
 
 
 class InMemoryMetadataStore(MetadataStorePort):
@@ -99,21 +110,57 @@ class InMemoryMetadataStore(MetadataStorePort):
         return self._db.get((tenant_id, metadata_id))
 
 
-class NoopLLMAdapter(LLMAdapterPort):
+class InMemoryResultCache(ResultCachePort):
+    """Bounded LRU keyed by (tenant_id, sha256, PROMPT_VERSION, top_k, llm_enabled)."""
+
+    def __init__(self, max_entries: int = 1024):
+        self._max = max_entries
+        self._data: "OrderedDict[Tuple, MetadataRecord]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple) -> Optional[MetadataRecord]:
+        with self._lock:
+            rec = self._data.get(key)
+            if rec is not None:
+                self._data.move_to_end(key)
+            return rec
+
+    def put(self, key: Tuple, record: MetadataRecord) -> None:
+        with self._lock:
+            self._data[key] = record
+            self._data.move_to_end(key)
+            if len(self._data) > self._max:
+                self._data.popitem(last=False)
+
+
+_CATEGORY_HINTS = (
+    ("legal", ("contract", "agreement", "clause", "party")),
+    ("finance", ("invoice", "payment", "amount", "tax")),
+    ("meeting-notes", ("meeting", "notes", "minutes", "action")),
+)
+
+
+class NoopLLMAdapter(LLMAdapterPort, FusedLLMAdapterPort):
     def summarize(self, text: str, tenant_id: str) -> str:
         # Very small heuristic summary (first ~40 words)
-        words = re.findall(r"\S+", text)
-        return " ".join(words[:40])
+        return self._summary(text)
     def categorize(self, text: str, tenant_id: str, max_labels: int = 5) -> List[str]:
         # Heuristic categories based on keyword presence
-        cats = []
-        lowered = text.lower()
-        if any(k in lowered for k in ("contract", "agreement", "clause", "party")):
-            cats.append("legal")
-        if any(k in lowered for k in ("invoice", "payment", "amount", "tax")):
-            cats.append("finance")
-        if any(k in lowered for k in ("meeting", "notes", "minutes", "action")):
-            cats.append("meeting-notes")
+        return self._categories(text.lower(), max_labels)
+    def extract_summary_and_categories(
+        self, text: str, tenant_id: str, max_labels: int = 5
+    ) -> Tuple[str, List[str]]:
+        # Fused path used by build_record: one call, both heuristics over the same text.
+        return self._summary(text), self._categories(text.lower(), max_labels)
+
+    @staticmethod
+    def _summary(text: str) -> str:
+        words = text.split(maxsplit=40)
+        return " ".join(words[:40])
+
+    @staticmethod
+    def _categories(lowered: str, max_labels: int) -> List[str]:
+        cats = [label for label, hints in _CATEGORY_HINTS if any(k in lowered for k in hints)]
         return cats[:max_labels]
 
 
@@ -121,9 +168,14 @@ class NoopLLMAdapter(LLMAdapterPort):
 # Core service functions
 # --------------------------
 
+_LANG_SAMPLE_CHARS = 1 << 16
+
+
 def _guess_language_simple(text: str) -> str:
     # Very rough heuristic; future: plug langid
-    ascii_ratio = sum(1 for ch in text if ord(ch) < 128) / max(1, len(text))
+    # ASCII-char ratio over a 64K-char prefix; the ascii codec drops the rest in C.
+    sample = text[:_LANG_SAMPLE_CHARS]
+    ascii_ratio = len(sample.encode("ascii", errors="ignore")) / max(1, len(sample))
     return "en" if ascii_ratio > 0.85 else "unknown"
 
 
@@ -133,13 +185,15 @@ def _guess_mime_simple(text: str) -> str:
 
 
 def _title_guess(text: str) -> Optional[str]:
-    first_line = text.strip().splitlines()[0] if text.strip() else ""
+    stripped = text.strip()
+    m = _LINE_BREAK_RE.search(stripped)
+    first_line = stripped[: m.start()] if m else stripped
     return first_line[:120] or None
 
 
 def _stats(text: str) -> Stats:
     chars = len(text)
-    words = len(re.findall(r"\S+", text))
+    words = len(text.split())
     lines = text.count("\n") + (1 if text and not text.endswith("\n") else 0)
     reading_time_ms = int((words / 200.0) * 60_000)  # 200 wpm baseline
     return Stats(chars=chars, words=words, lines=lines, reading_time_ms=reading_time_ms)
@@ -149,42 +203,86 @@ def _sha256_bytes(data: bytes) -> str:
     return hashlib.sha256(data).hexdigest()
 
 
+_HASH_CHUNK_CHARS = 1 << 16
+
+
+def _sha256_utf8(text: str) -> Tuple[str, int]:
+    """SHA-256 hex digest and UTF-8 byte length of text, encoded in 64K-char chunks."""
+    h = hashlib.sha256()
+    size = 0
+    # UTF-8 is stateless per code point, so slicing the str never splits a character.
+    for i in range(0, len(text), _HASH_CHUNK_CHARS):
+        chunk = text[i : i + _HASH_CHUNK_CHARS].encode("utf-8")
+        h.update(chunk)
+        size += len(chunk)
+    return h.hexdigest(), size
+
+
 def _ensure_text_from_input(
     inp: ExtractTextInput | ExtractBlobInput,
     blobs: BlobReaderPort
-) -> Tuple[str, int]:
+) -> Tuple[str, Optional[bytes]]:
+    """Return (text, raw) where raw is the original blob bytes, or None for text input."""
     if isinstance(inp, ExtractTextInput) or inp.kind == "text":
-        text = inp.text  # type: ignore[attr-defined]
-        size = len(text.encode("utf-8"))
-        return text, size
+        return inp.text, None  # type: ignore[attr-defined]
     elif inp.kind == "blob":
         raw = blobs.read(inp.blob_uri)  # type: ignore[attr-defined]
         try:
             text = raw.decode("utf-8", errors="replace")
         except Exception:
             text = raw.decode("latin-1", errors="replace")
-        return text, len(raw)
+        return text, raw
     else:
         raise InvalidInputError(f"Unknown input kind: {getattr(inp, 'kind', None)}")
 
 
+def _summary_and_categories(
+    llm: LLMAdapterPort, text: str, tenant_id: str, max_labels: int = 5
+) -> Tuple[str, List[str]]:
+    """One round trip when the adapter supports it, else the two-call port."""
+    if isinstance(llm, FusedLLMAdapterPort):
+        return llm.extract_summary_and_categories(text, tenant_id, max_labels=max_labels)
+    return llm.summarize(text, tenant_id), llm.categorize(text, tenant_id, max_labels=max_labels)
+
+
 def build_record(
     text: str,
-    size_bytes: int,
+    raw: Optional[bytes],
     tenant_id: str,
     source_id: Optional[str],
     keyword_extractor: KeywordExtractorPort,
     llm: Optional[LLMAdapterPort],
     llm_enabled: bool,
-    top_k: int
+    top_k: int,
+    cache: Optional[ResultCachePort] = None,
 ) -> MetadataRecord:
     now = datetime.utcnow()
+    # Blob inputs hash/size their original bytes (no decode -> re-encode round trip)
+    if raw is not None:
+        hash_hex, size_bytes = _sha256_bytes(raw), len(raw)
+    else:
+        hash_hex, size_bytes = _sha256_utf8(text)
+
+    cache_key = (tenant_id, hash_hex, PROMPT_VERSION, top_k, bool(llm_enabled and llm is not None))
+    if cache is not None:
+        hit = cache.get(cache_key)
+        if hit is not None:
+            # deep: keywords/categories lists must not be shared between records
+            return hit.model_copy(
+                deep=True,
+                update={
+                    "metadata_id": str(uuid.uuid4()),
+                    "source_id": source_id,
+                    "created_at": now,
+                    "ingested_at": now,
+                }
+            )
+
     lang = _guess_language_simple(text)
     mime = _guess_mime_simple(text)
     title = _title_guess(text)
     stats = _stats(text)
     keywords = keyword_extractor.top_keywords(text, top_k=top_k, language_hint=lang)
-    hash_hex = _sha256_bytes(text.encode("utf-8"))
 
     summary = None
     categories: Optional[List[str]] = None
@@ -192,13 +290,12 @@ def build_record(
     if llm_enabled and llm is not None:
         with _try_span("llm.extract"):
             try:
-                summary = llm.summarize(text, tenant_id)
-                categories = llm.categorize(text, tenant_id, max_labels=5)
+                summary, categories = _summary_and_categories(llm, text, tenant_id, max_labels=5)
             except Exception as e:
                 logger.exception("LLM extraction failed")
                 raise LLMFailedError(str(e))
 
-    return MetadataRecord(
+    record = MetadataRecord(
         metadata_id=str(uuid.uuid4()),
         tenant_id=tenant_id,
         source_id=source_id,
@@ -214,17 +311,25 @@ def build_record(
         created_at=now,
         ingested_at=now,
     )
+    if cache is not None:
+        # store a private copy so later mutations of `record` don't leak into hits
+        cache.put(cache_key, record.model_copy(deep=True))
+    return record
 
 
 # --------------------------
 # FastAPI Router
 # --------------------------
 
-class Dependencies(BaseModel):
-    blob_reader: BlobReaderPort = InMemoryBlobReader()
-    keyword_extractor: KeywordExtractorPort = SimpleKeywordExtractor()
-    store: MetadataStorePort = InMemoryMetadataStore()
-    llm: Optional[LLMAdapterPort] = NoopLLMAdapter()
+@dataclass(slots=True)
+class Dependencies:
+    # Plain container: resolved on every request, so no pydantic validation.
+    blob_reader: BlobReaderPort = field(default_factory=InMemoryBlobReader)
+    keyword_extractor: KeywordExtractorPort = field(default_factory=SimpleKeywordExtractor)
+    store: MetadataStorePort = field(default_factory=InMemoryMetadataStore)
+    llm: Optional[LLMAdapterPort] = field(default_factory=NoopLLMAdapter)
+    # Opt-in: set to InMemoryResultCache() (or another ResultCachePort) to reuse results
+    cache: Optional[ResultCachePort] = None
 
 
 deps_singleton = Dependencies()  # simple DI for v0.1
@@ -243,17 +348,18 @@ def extract(req: ExtractRequest, d: Dependencies = Depends(get_deps)) -> Envelop
 
     with _try_span("metadata.extract"):
         try:
-            text, size = _ensure_text_from_input(req.input, d.blob_reader)
+            text, raw = _ensure_text_from_input(req.input, d.blob_reader)
 
             record = build_record(
                 text=text,
-                size_bytes=size,
+                raw=raw,
                 tenant_id=req.options.tenant_id,
                 source_id=getattr(req.input, "source_id", None),
                 keyword_extractor=d.keyword_extractor,
                 llm=d.llm if req.options.llm.enabled else None,
                 llm_enabled=req.options.llm.enabled,
                 top_k=max(1, req.options.keyword.top_k),
+                cache=d.cache,
             )
 
             if req.options.store.persist:
@@ -295,7 +401,3 @@ def create_app() -> FastAPI:
     app = FastAPI(title="MetadataService")
     app.include_router(router)
     return app
-
----
-
-```python
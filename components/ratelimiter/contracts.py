@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-from typing import Any, Callable, Dict, Iterable, List, Literal, Optional, Tuple
-from pydantic import BaseModel, Field, PositiveInt, field_validator
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Literal, Optional, Tuple
+from pydantic import BaseModel, Field, PositiveInt, PrivateAttr, field_validator, model_validator
 import re
 
 Algorithm = Literal["token_bucket", "leaky_bucket"]
@@ -15,21 +15,35 @@ class Policy(BaseModel):
     burst: PositiveInt = Field(..., description="Max tokens in bucket")
     scope: Scope = Field("ip")
     path_pattern: str = Field(r".*", description="Regex to match request path")
-    methods: Optional[List[str]] = Field(None, description="List of HTTP methods; None means all")
+    methods: Optional[FrozenSet[str]] = Field(None, description="Set of HTTP methods; None means all")
     cost: PositiveInt = Field(1, description="Default cost per request")
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
+    _compiled_pattern: Optional[re.Pattern] = PrivateAttr(default=None)
+
     @field_validator("methods")
     @classmethod
-    def normalize_methods(cls, v: Optional[List[str]]) -> Optional[List[str]]:
+    def normalize_methods(cls, v: Optional[FrozenSet[str]]) -> Optional[FrozenSet[str]]:
         if v is None:
             return v
-        return [m.upper() for m in v]
+        return frozenset(m.upper() for m in v)
+
+    @model_validator(mode="after")
+    def compile_path_pattern(self) -> "Policy":
+        try:
+            self._compiled_pattern = re.compile(self.path_pattern)
+        except re.error as e:
+            raise ValueError(f"invalid path_pattern: {e}") from e
+        return self
 
-    def matches(self, method: str, path: str) -> bool:
-        if self.methods and method.upper() not in self.methods:
+    def matches(self, method_upper: str, path: str) -> bool:
+        """`method_upper` must already be upper-case (ASGI scopes carry it that way)."""
+        if self.methods and method_upper not in self.methods:
             return False
-        return re.search(self.path_pattern, path) is not None
+        pattern = self._compiled_pattern
+        if pattern is None:  # built via model_construct
+            pattern = self._compiled_pattern = re.compile(self.path_pattern)
+        return pattern.search(path) is not None
 
 
 class ConsumeRequest(BaseModel):
@@ -1,50 +1,129 @@
 from __future__ import annotations
 
+import math
 import re
-from typing import Callable, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.datastructures import MutableHeaders
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from .contracts import Policy
 from .service import RateLimiterService
 
 
-class RateLimiterMiddleware(BaseHTTPMiddleware):
-    """ASGI middleware that applies the first matching policy to each request."""
+_REGEX_META = frozenset(".^$*+?{}[]\\|()")
+_OPTIONAL_QUANTIFIERS = frozenset("*?{")
+
+
+def _literal_prefix(pattern: str) -> Optional[str]:
+    """Literal text every match of a `^`-anchored pattern must start with, else None."""
+    if not pattern.startswith("^") or "|" in pattern:
+        return None
+    out: List[str] = []
+    for ch in pattern[1:]:
+        if ch in _REGEX_META:
+            if ch in _OPTIONAL_QUANTIFIERS and out:
+                out.pop()  # the quantified char may be absent
+            break
+        out.append(ch)
+    return "".join(out)
+
+
+class _PolicyIndex:
+    """
+    First-match policy dispatch. Anchored patterns are bucketed by literal
+    prefix (grouped by prefix length, so a path costs one slice + dict lookup
+    per distinct length); only candidates, plus unanchored patterns, run regex.
+    """
+
+    def __init__(self, policies: List[Policy]) -> None:
+        self._policies = policies
+        by_len: Dict[int, Dict[str, List[int]]] = {}
+        self._unindexed: List[int] = []
+        for i, p in enumerate(policies):
+            prefix = _literal_prefix(p.path_pattern)
+            if prefix is None:
+                self._unindexed.append(i)
+            else:
+                by_len.setdefault(len(prefix), {}).setdefault(prefix, []).append(i)
+        self._by_len: List[Tuple[int, Dict[str, List[int]]]] = sorted(by_len.items())
+
+    def select(self, method: str, path: str) -> Optional[Policy]:
+        candidates = list(self._unindexed)
+        n = len(path)
+        for length, table in self._by_len:
+            if length > n:
+                break
+            hit = table.get(path[:length])
+            if hit:
+                candidates.extend(hit)
+        candidates.sort()
+        policies = self._policies
+        for i in candidates:
+            p = policies[i]
+            if p.matches(method, path):
+                return p
+        return None
+
+
+class RateLimiterMiddleware:
+    """
+    Pure ASGI middleware that applies the first matching policy to each request.
+    Works on the raw scope (no Request object, task group or response buffering);
+    allowed responses get X-RateLimit-* headers injected into http.response.start.
+    """
 
     def __init__(
         self,
-        app,
+        app: ASGIApp,
         policies: List[Policy],
         service: Optional[RateLimiterService] = None,
         user_header: str = "X-User-Id",
         tenant_header: str = "X-Tenant-Id",
         skip_paths: Optional[List[str]] = None,
     ):
-        super().__init__(app)
+        self.app = app
         self.policies = policies
+        self._index = _PolicyIndex(policies)
         self.service = service or RateLimiterService()
         self.user_header = user_header
         self.tenant_header = tenant_header
+        # ASGI header names are lowercase bytes
+        self._user_header_b = user_header.lower().encode("latin-1")
+        self._tenant_header_b = tenant_header.lower().encode("latin-1")
         self.skip_paths = skip_paths or [r"^/healthz$", r"^/metrics$"]
+        self._skip_res = [re.compile(p) for p in self.skip_paths]
+        # Policy.scope -> key builder, resolved once instead of an if/elif per request
+        self._key_builders: Dict[str, Callable[[Scope], str]] = {
+            "ip": self._key_ip,
+            "user": self._key_user,
+            "tenant": self._key_tenant,
+            "global": self._key_global,
+            "custom": self._key_custom,
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        path = request.url.path
-        method = request.method.upper()
+        path = scope["path"]
+        method = scope["method"].upper()
 
         # Skip known public endpoints
-        for pat in self.skip_paths:
-            if re.search(pat, path):
-                return await call_next(request)
+        for pat in self._skip_res:
+            if pat.search(path):
+                await self.app(scope, receive, send)
+                return
 
         policy = self._select_policy(method, path)
         if not policy:
             # no policy → allow
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
 
-        key = self._build_key(request, policy)
+        key = self._build_key(scope, policy)
         result = self.service.consume(key=key, policy=policy, cost=policy.cost)
 
         # Set standard headers
@@ -54,45 +133,60 @@ class RateLimiterMiddleware(BaseHTTPMiddleware):
         }
 
         if result.allowed:
-            response = await call_next(request)
-            for k, v in headers.items():
-                response.headers[k] = v
             # Soft "reset" time as best-effort (not exact): period window boundary heuristic
-            response.headers["X-RateLimit-Reset"] = str(policy.period)
-            return response
+            headers["X-RateLimit-Reset"] = str(policy.period)
+
+            async def send_with_headers(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    response_headers = MutableHeaders(scope=message)
+                    for k, v in headers.items():
+                        response_headers[k] = v
+                await send(message)
+
+            await self.app(scope, receive, send_with_headers)
         else:
-            headers["Retry-After"] = str(int(result.retry_after or 0))
-            headers["X-RateLimit-Reset"] = str(int(result.retry_after or policy.period))
-            return JSONResponse(
+            # retry_after is fractional seconds; headers carry whole seconds, rounded up
+            retry_after = math.ceil(result.retry_after or 0)
+            headers["Retry-After"] = str(retry_after)
+            headers["X-RateLimit-Reset"] = str(retry_after or policy.period)
+            response = JSONResponse(
                 status_code=429,
-                content={"error": "rate_limited", "retry_after": int(result.retry_after or 0)},
+                content={"error": "rate_limited", "retry_after": retry_after},
                 headers=headers,
             )
+            await response(scope, receive, send)
 
     def _select_policy(self, method: str, path: str) -> Optional[Policy]:
-        for p in self.policies:
-            if p.matches(method, path):
-                return p
-        return None
+        return self._index.select(method, path)
 
-    def _build_key(self, request: Request, policy: Policy) -> str:
-        scope = policy.scope
-        if scope == "ip":
-            client = request.client.host if request.client else "unknown"
-            return f"ip:{client}"
-        elif scope == "user":
-            user = request.headers.get(self.user_header, "anonymous")
-            return f"user:{user}"
-        elif scope == "tenant":
-            tenant = request.headers.get(self.tenant_header, "default")
-            return f"tenant:{tenant}"
-        elif scope == "global":
-            return "global:*"
-        elif scope == "custom":
-            # Placeholder: Future dependency to resolve custom key builders
-            # For now, fall back to IP
-            client = request.client.host if request.client else "unknown"
-            return f"custom:{client}"
-        else:
-            # Should be prevented by validation
-            return "unknown"
\ No newline at end of file
+    def _header(self, scope: Scope, name: bytes, default: str) -> str:
+        for k, v in scope["headers"]:
+            if k == name:
+                return v.decode("latin-1")
+        return default
+
+    def _client_host(self, scope: Scope) -> str:
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    def _build_key(self, scope: Scope, policy: Policy) -> str:
+        builder = self._key_builders.get(policy.scope)
+        # Unknown scopes should be prevented by validation
+        return builder(scope) if builder else "unknown"
+
+    def _key_ip(self, scope: Scope) -> str:
+        return f"ip:{self._client_host(scope)}"
+
+    def _key_user(self, scope: Scope) -> str:
+        return f"user:{self._header(scope, self._user_header_b, 'anonymous')}"
+
+    def _key_tenant(self, scope: Scope) -> str:
+        return f"tenant:{self._header(scope, self._tenant_header_b, 'default')}"
+
+    def _key_global(self, scope: Scope) -> str:
+        return "global:*"
+
+    def _key_custom(self, scope: Scope) -> str:
+        # Placeholder: Future dependency to resolve custom key builders
+        # For now, fall back to IP
+        return f"custom:{self._client_host(scope)}"
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import math
 import time
 from typing import Callable, List, Optional, Tuple
 
@@ -9,13 +8,28 @@ from .contracts import Policy, ConsumeRequest, ConsumeResult, QuotaSnapshot
 from .store import StateStore, InMemoryStore
 
 TimeFn = Callable[[], float]
+TimeNsFn = Callable[[], int]
+
+# Token-bucket balances are fixed-point: 1 token == UTOKENS microtokens.
+UTOKENS = 1_000_000
+_NS_PER_SEC = 1_000_000_000
 
 class RateLimiterService:
     """Core limiter implementing token-bucket and leaky-bucket with an abstract state store."""
 
-    def __init__(self, store: Optional[StateStore] = None, now: Optional[TimeFn] = None):
+    def __init__(
+        self,
+        store: Optional[StateStore] = None,
+        now: Optional[TimeFn] = None,
+        now_ns: Optional[TimeNsFn] = None,
+    ):
         self.store = store or InMemoryStore()
-        self._now = now or time.monotonic
+        if now_ns is None:
+            # `now` is a seconds clock kept for callers/tests that inject one.
+            now_ns = (lambda: int(now() * _NS_PER_SEC)) if now is not None else time.monotonic_ns
+        # Both algorithms keep integer nanosecond timestamps in state; they are only
+        # converted to float seconds at the API boundary (QuotaSnapshot).
+        self._now_ns = now_ns
 
     # ---------- Public API ----------
     def consume(self, key: str, policy: Policy, cost: int = 1) -> ConsumeResult:
@@ -26,7 +40,8 @@ class RateLimiterService:
         else:
             raise ValueError(f"Unsupported algorithm: {policy.algorithm}")
 
-        return ConsumeResult(
+        # Fields are computed here, not user input: skip pydantic validation.
+        return ConsumeResult.model_construct(
             allowed=allowed,
             remaining=remaining,
             retry_after=retry_after,
@@ -40,18 +55,18 @@ class RateLimiterService:
             tokens = None
             last_refill_ts = None
             if state:
-                tokens = state.get("tokens")
-                last_refill_ts = state.get("last_refill_ts")
-            return QuotaSnapshot(
+                tokens = state["utokens"] / UTOKENS
+                last_refill_ts = state["last_ns"] / _NS_PER_SEC
+            return QuotaSnapshot.model_construct(
                 key=key, tokens=tokens, last_refill_ts=last_refill_ts, algorithm="token_bucket"
             )
         else:
             level = None
             last_refill_ts = None
             if state:
-                level = state.get("level")
-                last_refill_ts = state.get("last_refill_ts")
-            return QuotaSnapshot(
+                level = state["level"]
+                last_refill_ts = state["last_ns"] / _NS_PER_SEC
+            return QuotaSnapshot.model_construct(
                 key=key, level=level, last_refill_ts=last_refill_ts, algorithm="leaky_bucket"
             )
 
@@ -63,94 +78,70 @@ class RateLimiterService:
         return f"ratelimiter:{policy.algorithm}:{policy.name}:{key}"
 
     def _consume_token_bucket(self, key: str, policy: Policy, cost: int) -> tuple[bool, float, Optional[float]]:
+        """
+        Integer-only token bucket. State is {"utokens", "frac", "last_ns"} where
+        refill is elapsed_ns * rate * UTOKENS / period_ns; `frac` carries the
+        division remainder so frequent calls never lose refill to truncation.
+        """
         bucket_key = self._bucket_key(key, policy)
-        now = self._now()
-
-        def update(state):
-            if not state:
-                state = {"tokens": float(policy.burst), "last_refill_ts": now}
-            tokens = state["tokens"]
-            last = state["last_refill_ts"]
-
-            rate_per_sec = policy.rate / policy.period
-            # refill
-            elapsed = max(0.0, now - last)
-            tokens = min(float(policy.burst), tokens + elapsed * rate_per_sec)
-
-            allowed = tokens >= cost
-            retry_after = None
-            if allowed:
-                tokens -= cost
-            else:
-                deficit = cost - tokens
-                # time until enough tokens accumulate
-                retry_after = math.ceil(deficit / rate_per_sec)
-
-            # update state
-            new_state = {"tokens": tokens, "last_refill_ts": now}
-            return new_state, allowed, tokens, retry_after
-
-        def wrapper(curr):
-            new_state, allowed, rem, retry_after = update(curr)
-            return new_state
+        now = self._now_ns()
+        period_ns = policy.period * _NS_PER_SEC
+        rate_u = policy.rate * UTOKENS
+        cap = policy.burst * UTOKENS
+        ucost = cost * UTOKENS
+        # allowed, remaining, retry_after — filled in by upd under the store lock
+        decision: list = [False, 0.0, None]
 
-        # Two passes: first to compute; second store returns new state— but we need decision.
-        # Use update once and recompute decision from returned state + inputs.
-        decision: dict = {}
         def upd(curr):
-            if not curr:
-                curr = {"tokens": float(policy.burst), "last_refill_ts": now}
-            tokens = curr["tokens"]
-            last = curr["last_refill_ts"]
-            rate_per_sec = policy.rate / policy.period
-            elapsed = max(0.0, now - last)
-            tokens = min(float(policy.burst), tokens + elapsed * rate_per_sec)
-            allowed = tokens >= cost
-            retry_after = None
-            if allowed:
-                tokens -= cost
+            if curr:
+                # refill
+                elapsed = now - curr["last_ns"]
+                utokens = curr["utokens"]
+                frac = curr["frac"]
+                if elapsed > 0:
+                    gained, frac = divmod(elapsed * rate_u + frac, period_ns)
+                    utokens += gained
+                if utokens >= cap:
+                    utokens, frac = cap, 0
             else:
-                deficit = cost - tokens
-                retry_after = math.ceil(deficit / rate_per_sec)
-            new_state = {"tokens": tokens, "last_refill_ts": now}
-            decision.update({"allowed": allowed, "remaining": tokens, "retry_after": retry_after})
-            return new_state
+                utokens, frac = cap, 0
+            if utokens >= ucost:
+                utokens -= ucost
+                decision[0] = True
+            else:
+                # seconds until the deficit refills (HTTP layer rounds up)
+                need = (ucost - utokens) * period_ns - frac
+                decision[2] = need / (rate_u * _NS_PER_SEC)
+            decision[1] = utokens / UTOKENS
+            return {"utokens": utokens, "frac": frac, "last_ns": now}
 
         self.store.update(bucket_key, upd)
-        return decision["allowed"], decision["remaining"], decision["retry_after"]
+        return decision[0], decision[1], decision[2]
 
     def _consume_leaky_bucket(self, key: str, policy: Policy, cost: int) -> tuple[bool, float, Optional[float]]:
         bucket_key = self._bucket_key(key, policy)
-        now = self._now()
+        now = self._now_ns()
+        burst_f = float(policy.burst)
+        drain_per_sec = policy.rate / policy.period
+        drain_per_ns = drain_per_sec / _NS_PER_SEC
+        # Time until (level) falls to (burst - cost) makes room for 'cost'
+        target_level = burst_f - cost
+        decision: list = [False, 0.0, None]
 
         def upd(curr):
-            if not curr:
-                curr = {"level": 0.0, "last_refill_ts": now}
-            level = curr["level"]
-            last = curr["last_refill_ts"]
-            drain_per_sec = policy.rate / policy.period
-            elapsed = max(0.0, now - last)
-            # drain
-            level = max(0.0, level - elapsed * drain_per_sec)
-
-            allowed = (level + cost) <= float(policy.burst)
-            retry_after = None
-            if allowed:
+            if curr:
+                # drain
+                elapsed = max(0, now - curr["last_ns"])
+                level = max(0.0, curr["level"] - elapsed * drain_per_ns)
+            else:
+                level = 0.0
+            if level <= target_level:
                 level += cost
+                decision[0] = True
             else:
-                # Time until the bucket drains enough for 'cost'
-                needed = (level + cost) - float(policy.burst)
-                # To make room for 'needed', but more simply: time until (level) falls to (burst - cost)
-                target_level = float(policy.burst) - cost
-                if level <= target_level:
-                    retry_after = 0
-                else:
-                    retry_after = math.ceil((level - target_level) / drain_per_sec)
-
-            new_state = {"level": level, "last_refill_ts": now}
-            decision.update({"allowed": allowed, "remaining": max(0.0, float(policy.burst) - level), "retry_after": retry_after})
-            return new_state
-
-        decision: dict = {}
+                decision[2] = (level - target_level) / drain_per_sec
+            decision[1] = max(0.0, burst_f - level)
+            return {"level": level, "last_ns": now}
+
         self.store.update(bucket_key, upd)
-        return decision["allowed"], decision["remaining"], decision["retry_after"]
\ No newline at end of file
+        return decision[0], decision[1], decision[2]
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import threading
 import time
+import weakref
 from typing import Any, Callable, Dict, Optional, Tuple
 
 class StateStore:
@@ -19,26 +20,43 @@ class StateStore:
 
 
 class InMemoryStore(StateStore):
-    """Thread-safe in-memory store with coarse-grained lock.
+    """Thread-safe in-memory store with one lock per key.
+
+    Each bucket key gets its own lock, created lazily under a short-lived meta
+    lock and held weakly: once no caller is using a key's lock it is dropped,
+    so the lock table does not grow with cold keys. Updates to different keys
+    never contend. Single dict get/set is atomic under the GIL.
 
     For single-process dev/testing. Multi-process needs a Redis adapter (vNext).
     """
 
     def __init__(self):
         self._data: Dict[str, dict] = {}
-        self._lock = threading.RLock()
+        self._key_locks: "weakref.WeakValueDictionary[str, Any]" = weakref.WeakValueDictionary()
+        self._meta_lock = threading.Lock()
+
+    def _lock_for(self, key: str):
+        lock = self._key_locks.get(key)
+        if lock is None:
+            with self._meta_lock:
+                lock = self._key_locks.get(key)
+                if lock is None:
+                    lock = threading.Lock()
+                    self._key_locks[key] = lock
+        return lock
 
     def get(self, key: str) -> Optional[dict]:
-        with self._lock:
-            return self._data.get(key)
+        return self._data.get(key)
 
     def set(self, key: str, value: dict) -> None:
-        with self._lock:
+        with self._lock_for(key):
             self._data[key] = value
 
     def update(self, key: str, fn):
-        with self._lock:
-            current = self._data.get(key)
-            new_value = fn(current)
+        # Hold a strong reference for the whole read-modify-write so concurrent
+        # callers on the same key resolve to this same lock.
+        lock = self._lock_for(key)
+        with lock:
+            new_value = fn(self._data.get(key))
             self._data[key] = new_value
-            return new_value
\ No newline at end of file
+            return new_value
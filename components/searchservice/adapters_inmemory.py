@@ -1,10 +1,20 @@
 from __future__ import annotations
 
+import functools
 import hashlib
+import heapq
 import math
+import operator
 import random
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+import struct
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover
+    np = None
 
 from .contracts import (
     EmbeddingAdapterPort,
@@ -17,20 +27,39 @@ from .contracts import (
 )
 
 
+# sha256 digest (32 bytes) read as 16 big-endian uint16 words in one C call
+_DIGEST_WORDS = struct.Struct(">16H")
+
+
 def _hash_to_unit_vector(text: str, dims: int = 16) -> List[float]:
     """Deterministic embedding: split sha256 into dims chunks."""
     h = hashlib.sha256(text.encode("utf-8")).digest()
     # 32 bytes → map into dims floats
-    vals = [int.from_bytes(h[i:i+2], "big") for i in range(0, min(32, 2 * dims), 2)]
-    # pad if needed
-    while len(vals) < dims:
-        vals.append(0)
+    vals = _DIGEST_WORDS.unpack(h)[:dims]
     # normalize
     total = sum(vals) or 1
-    vec = [v / total for v in vals[:dims]]
+    vec = [v / total for v in vals]
+    # pad if needed
+    vec.extend([0.0] * (dims - len(vec)))
     return vec
 
 
+def _bulk_embed(texts: Sequence[str], dims: int = 16):
+    """
+    _hash_to_unit_vector for many texts at once: digests are computed in one
+    tight loop and the word decoding/normalisation runs as (N, dims) array ops.
+    Returns an (N, dims) float64 array (identical values to the scalar path).
+    """
+    sha256 = hashlib.sha256
+    raw = b"".join([sha256(t.encode("utf-8")).digest() for t in texts])
+    words = np.frombuffer(raw, dtype=">u2").reshape(len(texts), 16)[:, :dims].astype(np.float64)
+    total = words.sum(axis=1, keepdims=True)
+    vecs = words / np.where(total == 0, 1, total)
+    if dims > vecs.shape[1]:
+        vecs = np.pad(vecs, ((0, 0), (0, dims - vecs.shape[1])))
+    return vecs
+
+
 class InMemoryEmbeddingAdapter(EmbeddingAdapterPort):
     async def embed_query(self, text: str) -> List[float]:
         return _hash_to_unit_vector(text, 16)
@@ -43,96 +72,212 @@ class _Doc:
     vector: List[float]
     metadata: Dict[str, Any]
     text: str
+    norm: float = field(init=False)
 
+    def __post_init__(self) -> None:
+        self.norm = _l2_norm(self.vector)
 
-def _cosine(a: List[float], b: List[float]) -> float:
-    num = sum(x*y for x, y in zip(a, b))
-    da = math.sqrt(sum(x*x for x in a)) or 1.0
-    db = math.sqrt(sum(y*y for y in b)) or 1.0
-    return num / (da * db)
 
+def _l2_norm(v: List[float]) -> float:
+    return math.sqrt(sum(x*x for x in v)) or 1.0
 
-def _passes(cond: FilterCondition, md: Dict[str, Any]) -> bool:
-    val = md.get(cond.field)
-    if cond.op == Op.eq:
-        return val == cond.value
-    if cond.op == Op.ne:
-        return val != cond.value
-    if cond.op == Op.lt:
-        try:
-            return val < cond.value
-        except Exception:
-            return False
-    if cond.op == Op.lte:
-        try:
-            return val <= cond.value
-        except Exception:
-            return False
-    if cond.op == Op.gt:
-        try:
-            return val > cond.value
-        except Exception:
-            return False
-    if cond.op == Op.gte:
-        try:
-            return val >= cond.value
-        except Exception:
-            return False
-    if cond.op == Op.contains:
-        try:
-            return cond.value in val
-        except Exception:
-            return False
-    if cond.op == Op.in_:
-        try:
-            return val in cond.value
-        except Exception:
-            return False
-    if cond.op == Op.nin:
+
+def _dot(a: List[float], b: List[float]) -> float:
+    # cosine of two unit vectors
+    return sum(x*y for x, y in zip(a, b))
+
+
+# (metadata value, condition value) -> bool, one C-level or tiny callable per op
+_OP_TABLE: Dict[Op, Callable[[Any, Any], bool]] = {
+    Op.eq: operator.eq,
+    Op.ne: operator.ne,
+    Op.lt: operator.lt,
+    Op.lte: operator.le,
+    Op.gt: operator.gt,
+    Op.gte: operator.ge,
+    Op.contains: lambda v, c: c in v,
+    Op.in_: lambda v, c: v in c,
+    Op.nin: lambda v, c: v not in c,
+}
+
+
+def _condition_predicate(cond: FilterCondition) -> Callable[[Dict[str, Any]], bool]:
+    """Resolve one condition's op once; the returned closure only compares."""
+    cmp = _OP_TABLE.get(cond.op)
+    if cmp is None:
+        return lambda md: True
+    field, value = cond.field, cond.value
+
+    def pred(md: Dict[str, Any]) -> bool:
+        # incomparable types (None < 3, 5 in None, ...) simply don't match
         try:
-            return val not in cond.value
+            return cmp(md.get(field), value)
         except Exception:
             return False
-    return True
+    return pred
 
 
-def _apply_filter(md: Dict[str, Any], flt: Filter) -> bool:
-    # must
-    if any(not _passes(c, md) for c in flt.must):
-        return False
-    # must_not
-    if any(_passes(c, md) for c in flt.must_not):
-        return False
-    # should improves ranking; here we don't boost but require at least 1 if provided
-    if flt.should:
-        return any(_passes(c, md) for c in flt.should)
-    return True
+def _compile_filter(flt: Filter) -> Optional[Callable[[Dict[str, Any]], bool]]:
+    """
+    Turn a Filter into a metadata predicate once per query instead of
+    re-dispatching every condition for every doc. None means "match all".
+    """
+    must = [_condition_predicate(c) for c in flt.must]
+    must_not = [_condition_predicate(c) for c in flt.must_not]
+    should = [_condition_predicate(c) for c in flt.should]
+    if not (must or must_not or should):
+        return None
+
+    def match(md: Dict[str, Any]) -> bool:
+        # must
+        for p in must:
+            if not p(md):
+                return False
+        # must_not
+        for p in must_not:
+            if p(md):
+                return False
+        # should improves ranking; here we don't boost but require at least 1 if provided
+        if should:
+            return any(p(md) for p in should)
+        return True
+    return match
+
+
+def _top_k(scores, k: int):
+    """
+    Indices of the k highest scores, best first, in O(N + k log k).
+    Ties keep index order (same result as a stable descending sort).
+    """
+    n = len(scores)
+    if k >= n:
+        return np.argsort(-scores, kind="stable")
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    kth = np.partition(scores, n - k)[n - k]
+    above = np.flatnonzero(scores > kth)
+    ties = np.flatnonzero(scores == kth)[: k - len(above)]
+    idx = np.concatenate((above, ties))
+    return idx[np.lexsort((idx, -scores[idx]))]
+
+
+# 4096 rows x 16 dims x 4 B = 256 KiB per tile: the tile and its scores stay L2-resident
+_BLOCK_ROWS = 4096
+
+
+def _blocked_top_k(score_rows: Callable[[int, int], Any], n: int, k: int):
+    """
+    Top-k over n rows scored tile by tile; score_rows(start, stop) returns the
+    scores of rows [start, stop). Only k candidates survive each tile, so the
+    full score vector is never materialised. Returns (positions, scores), best
+    first, with the same tie order as _top_k.
+    """
+    if n <= _BLOCK_ROWS:
+        scores = score_rows(0, n)
+        idx = _top_k(scores, k)
+        return idx, scores[idx]
+    cand_idx = np.empty(0, dtype=np.intp)
+    cand_scores = np.empty(0, dtype=np.float32)
+    for start in range(0, n, _BLOCK_ROWS):
+        s = score_rows(start, min(n, start + _BLOCK_ROWS))
+        sel = _top_k(s, k)
+        cand_idx = np.concatenate((cand_idx, sel + start))
+        cand_scores = np.concatenate((cand_scores, s[sel]))
+        keep = np.lexsort((cand_idx, -cand_scores))[:k]
+        cand_idx, cand_scores = cand_idx[keep], cand_scores[keep]
+    return cand_idx, cand_scores
+
+
+def _unit_f32(vector: List[float]):
+    """Query as a fresh contiguous float32 unit vector (zero stays zero), so
+    `matrix @ q` hits BLAS sgemv directly with no dtype casts or copies."""
+    q = np.array(vector, dtype=np.float32)
+    n = np.linalg.norm(q)
+    if n:
+        q /= n
+    return q
+
+
+def _quantize_rows(m):
+    """Symmetric per-row int8 quantisation: returns (q, scale) with row ~= q / scale."""
+    peak = np.abs(m).max(axis=1)
+    scale = (127.0 / np.where(peak == 0, 1, peak)).astype(np.float32)
+    return np.round(m * scale[:, None]).astype(np.int8), scale
+
+
+_SAMPLE_CORPUS: Tuple[Tuple[str, str, Dict[str, Any]], ...] = (
+    ("docA", "Contract law basics and precedents.", {"title": "Contract Law 101", "tags": ["contract","law"], "path": "/a"}),
+    ("docB", "Criminal law overview and notable cases.", {"title": "Criminal Law", "tags": ["criminal","law"], "path": "/b"}),
+    ("docC", "Tort law: negligence and liability discussion.", {"title": "Tort Law", "tags": ["tort","law"], "path": "/c"}),
+    ("docD", "Civil procedure rules and motions.", {"title": "Civil Procedure", "tags": ["civil","procedure"], "path": "/d"}),
+    ("docE", "Case study: contract breach remedies.", {"title": "Breach Remedies", "tags": ["contract","case"], "path": "/e"}),
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _sample_vectors() -> Tuple[Tuple[float, ...], ...]:
+    """Embeddings of _SAMPLE_CORPUS, hashed once per process however many adapters are built."""
+    texts = [text for _, text, _ in _SAMPLE_CORPUS]
+    if np is not None:
+        return tuple(map(tuple, _bulk_embed(texts).tolist()))
+    return tuple(tuple(_hash_to_unit_vector(t)) for t in texts)
 
 
 class InMemoryVectorStoreAdapter(VectorStoreAdapterPort):
-    def __init__(self, docs: List[_Doc]):
-        self._docs = docs
+    def __init__(self, docs: List[_Doc], quantize: bool = False):
+        # Struct-of-arrays: row i of each column describes one doc. VectorHit
+        # objects are only built for the rows that make it into the window.
+        self._ids = [d.id for d in docs]
+        # Tenant ids and metadata keys are interned so tenant lookups and
+        # md.get(cond.field) (field names are interned by FilterCondition)
+        # compare by identity first.
+        self._metadata = [{sys.intern(k): v for k, v in d.metadata.items()} for d in docs]
+        self._texts = [d.text for d in docs]
+        # per-row {snippet_max_chars: snippet}; filled lazily by _snippet()
+        self._snippets: List[Dict[int, str]] = [{} for _ in docs]
+        # Vectors are stored L2-normalised, so cosine is a plain dot product
+        # against the normalised query: with numpy as one float32 (N, D)
+        # matrix (a query is a single mat-vec product), otherwise as lists.
+        self._matrix = None
+        # tenant id -> its row indices, so a query never scans other tenants'
+        # rows (N ints in total however many tenants share the process)
+        tenant_rows: Dict[str, List[int]] = {}
+        for i, d in enumerate(docs):
+            tenant_rows.setdefault(sys.intern(d.tenant_id), []).append(i)
+        self._tenant_rows: Dict[str, Any] = tenant_rows
+        self._vectors: List[List[float]] = []
+        # Opt-in int8 copy of the matrix (4x fewer bytes scanned per query, at
+        # ~1e-3 score error); the float32 matrix stays for A/B comparison.
+        self._vectors_i8 = None
+        self._scales = None
+        if np is not None and docs:
+            m = np.array([d.vector for d in docs], dtype=np.float32)
+            norms = np.linalg.norm(m, axis=1, keepdims=True)
+            self._matrix = np.ascontiguousarray(m / np.where(norms == 0, 1, norms), dtype=np.float32)
+            self._tenant_rows = {t: np.asarray(r, dtype=np.intp) for t, r in tenant_rows.items()}
+            if quantize:
+                self._vectors_i8, self._scales = _quantize_rows(self._matrix)
+            # Immutable after construction: safe to share across threads.
+            for arr in (self._matrix, self._vectors_i8, self._scales, *self._tenant_rows.values()):
+                if arr is not None:
+                    arr.flags.writeable = False
+        else:
+            self._vectors = [[x / d.norm for x in d.vector] for d in docs]
 
     @classmethod
     def bootstrap_sample(cls) -> "InMemoryVectorStoreAdapter":
         rng = random.Random(1337)
         docs: List[_Doc] = []
         tenants = ["test-tenant", "alpha", "beta"]
-        corpus = [
-            ("docA", "Contract law basics and precedents.", {"title": "Contract Law 101", "tags": ["contract","law"], "path": "/a"}),
-            ("docB", "Criminal law overview and notable cases.", {"title": "Criminal Law", "tags": ["criminal","law"], "path": "/b"}),
-            ("docC", "Tort law: negligence and liability discussion.", {"title": "Tort Law", "tags": ["tort","law"], "path": "/c"}),
-            ("docD", "Civil procedure rules and motions.", {"title": "Civil Procedure", "tags": ["civil","procedure"], "path": "/d"}),
-            ("docE", "Case study: contract breach remedies.", {"title": "Breach Remedies", "tags": ["contract","case"], "path": "/e"}),
-        ]
-        for i, (did, text, md) in enumerate(corpus):
+        vecs = _sample_vectors()
+        for i, (did, text, md) in enumerate(_SAMPLE_CORPUS):
             tenant_id = tenants[0]  # keep all in test-tenant for tests
-            vec = _hash_to_unit_vector(text)
+            vec = list(vecs[i])
             docs.append(_Doc(id=did, tenant_id=tenant_id, vector=vec, metadata=md, text=text))
         return cls(docs)
 
     def count_documents(self) -> int:
-        return len(self._docs)
+        return len(self._ids)
 
     async def query(
         self,
@@ -145,25 +290,86 @@ class InMemoryVectorStoreAdapter(VectorStoreAdapterPort):
         snippet_max_chars: int,
         metadata_fields: Sequence[str],
     ) -> VectorHits:
-        # filter by tenant
-        pool = [d for d in self._docs if d.tenant_id == tenant_id and _apply_filter(d.metadata, filters)]
-        if vector is None:
-            # Pure filter search; score = 0; stable order
-            ranked = [(0.0, d) for d in pool]
+        if vector is not None and self._matrix is not None:
+            total, ranked = self._rank(tenant_id, vector, filters, offset + top_k)
         else:
-            ranked = [(_cosine(vector, d.vector), d) for d in pool]
-            ranked.sort(key=lambda t: t[0], reverse=True)
-        total = len(ranked)
+            total, ranked = self._rank_py(tenant_id, vector, filters, offset + top_k)
         window = ranked[offset : offset + top_k]
+        # metadata_fields is honoured here, once; execute_search does not re-filter
+        allowed = frozenset(metadata_fields)
         hits = []
-        for score, d in window:
-            snippet = d.text[:snippet_max_chars] if include_snippets else None
-            md = d.metadata.copy()
-            if metadata_fields:
-                md = {k: v for k, v in md.items() if k in metadata_fields}
-            hits.append(VectorHit(doc_id=d.id, score=float(score), metadata=md, snippet=snippet))
+        for score, i in window:
+            snippet = self._snippet(i, snippet_max_chars) if include_snippets else None
+            if allowed:
+                md = {k: v for k, v in self._metadata[i].items() if k in allowed}
+            else:
+                # no projection: hand out the stored dict itself (hits are
+                # serialised, never mutated), saving a copy per hit
+                md = self._metadata[i]
+            hits.append(VectorHit(doc_id=self._ids[i], score=float(score), metadata=md, snippet=snippet))
         return VectorHits(total=total, hits=hits)
 
+    def _snippet(self, i: int, max_chars: int) -> str:
+        text = self._texts[i]
+        if len(text) <= max_chars:
+            return text  # slicing would return this same object anyway
+        # Requests mostly use one or two sizes (240 is the default), so each
+        # row keeps its snippet per size instead of re-slicing on every hit.
+        cache = self._snippets[i]
+        snippet = cache.get(max_chars)
+        if snippet is None:
+            snippet = cache[max_chars] = text[:max_chars]
+        return snippet
+
+    def _pool(self, rows: Sequence[int], filters: Filter) -> Sequence[int]:
+        match = _compile_filter(filters)
+        if match is None:
+            return rows
+        metadata = self._metadata
+        return [i for i in rows if match(metadata[i])]
+
+    def _rank(
+        self, tenant_id: str, vector: List[float], filters: Filter, k: int
+    ) -> Tuple[int, List[Tuple[float, int]]]:
+        """Returns (pool size, best k (score, row) pairs in rank order)."""
+        rows = self._pool(self._tenant_rows.get(tenant_id, ()), filters)
+        if len(rows) == 0:
+            return 0, []
+        rows = np.asarray(rows, dtype=np.intp)  # no copy for an unfiltered tenant index
+        q = _unit_f32(vector)
+        if self._vectors_i8 is not None:
+            q_i8, q_scale = _quantize_rows(q[None, :])
+            q_i32, q_scale = q_i8[0].astype(np.int32), q_scale[0]
+            vectors_i8, scales = self._vectors_i8, self._scales
+
+            def score_rows(start: int, stop: int):
+                block = rows[start:stop]
+                dots = vectors_i8[block].astype(np.int32) @ q_i32
+                return (dots / (scales[block] * q_scale)).astype(np.float32)
+        else:
+            matrix = self._matrix
+
+            def score_rows(start: int, stop: int):
+                return matrix[rows[start:stop]] @ q
+        pos, scores = _blocked_top_k(score_rows, len(rows), k)
+        return len(rows), [(float(sc), int(rows[j])) for j, sc in zip(pos, scores)]
+
+    def _rank_py(
+        self, tenant_id: str, vector: Optional[List[float]], filters: Filter, k: int
+    ) -> Tuple[int, List[Tuple[float, int]]]:
+        """Pure-Python _rank; also serves filter-only queries (vector is None)."""
+        # filter by tenant
+        pool = self._pool(self._tenant_rows.get(tenant_id, ()), filters)
+        if vector is None:
+            # Pure filter search; score = 0; stable order
+            return len(pool), [(0.0, i) for i in pool[:k]]
+        q_norm = _l2_norm(vector)
+        q = [x / q_norm for x in vector]
+        vectors = self._vectors
+        scored = [(_dot(q, vectors[i]), i) for i in pool]
+        # selection, not a full sort; nlargest keeps sorted()'s tie order
+        return len(pool), heapq.nlargest(k, scored, key=operator.itemgetter(0))
+
 ---
 
 ```python
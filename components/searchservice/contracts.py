@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import enum
+import sys
 import uuid
 from dataclasses import dataclass
 from typing import Any, Dict, List, Literal, Optional, Sequence, Tuple
 
-from pydantic import BaseModel, Field, conint, validator
+from pydantic import BaseModel, Field, conint, field_validator, validator
 
 
 # ---------- Errors ----------
@@ -55,6 +56,12 @@ class FilterCondition(BaseModel):
     op: Op
     value: Any
 
+    @field_validator("field")
+    @classmethod
+    def intern_field(cls, v: str) -> str:
+        # metadata keys are interned by the in-memory adapter; match by identity
+        return sys.intern(v)
+
 
 class Filter(BaseModel):
     # DNF: (AND groups) OR (AND groups) — simplified here as top-level must/should/must_not
@@ -104,21 +111,27 @@ class EmbeddingAdapterPort:
         raise NotImplementedError
 
 
-@dataclass
+@dataclass(slots=True)
 class VectorHit:
+    # metadata may be the adapter's own stored dict: treat it as read-only
     doc_id: str
     score: float
     metadata: Dict[str, Any]
     snippet: Optional[str]
 
 
-class VectorHits(BaseModel):
+@dataclass(slots=True)
+class VectorHits:
+    # internal adapter -> core transfer object; not validated
     total: int
-    hits: List[VectorHit]  # pydantic will accept dataclasses as well
+    hits: List[VectorHit]
 
 
 class VectorStoreAdapterPort:
-    """Port for vector similarity search."""
+    """
+    Port for vector similarity search.
+    Hit metadata is projected to `metadata_fields` by the adapter (all fields when empty).
+    """
 
     async def query(
         self,
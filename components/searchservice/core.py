@@ -1,8 +1,14 @@
+import itertools
 import math
 import time
 import uuid
 from typing import List, Optional, Sequence
 
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover
+    np = None
+
 from .contracts import (
     EmbeddingAdapterPort,
     Filter,
@@ -15,9 +21,24 @@ from .contracts import (
 )
 
 
+# IDs are "<random per-process prefix>-<counter>": unique across replicas and
+# restarts like a uuid4, but only one urandom read per process, not per request.
+_PROCESS_ID = uuid.uuid4().hex[:16]
+_ID_COUNTER = itertools.count()
+
+
+def new_id() -> str:
+    return f"{_PROCESS_ID}-{next(_ID_COUNTER):x}"
+
+
 def _zscore_fusion(vscores: List[float]) -> List[float]:
     if not vscores:
         return vscores
+    if np is not None:
+        a = np.asarray(vscores, dtype=np.float64)
+        # sample std; a single score (or all equal) divides by 1 like the loop below
+        sd = float(a.std(ddof=1)) if a.size > 1 else 0.0
+        return ((a - a.mean()) / (sd if sd > 0 else 1.0)).tolist()
     mean = sum(vscores) / len(vscores)
     var = sum((s - mean) ** 2 for s in vscores) / max(1, (len(vscores) - 1))
     sd = math.sqrt(var) if var > 0 else 1.0
@@ -57,20 +78,23 @@ async def execute_search(
     )
 
     # If hybrid with future keyword path, apply fusion here.
-    # For now, just return vhits as-is.
+    # For now, just return vhits as-is. The adapter has already projected
+    # metadata to req.metadata_fields (part of the VectorStoreAdapterPort contract).
+    # Hit fields come straight from the adapter's typed output: skip pydantic
+    # validation and only validate at the HTTP boundary.
     hits = [
-        SearchHit(
+        SearchHit.model_construct(
             doc_id=h.doc_id,
             score=float(h.score),
-            metadata={k: v for k, v in (h.metadata or {}).items() if (not req.metadata_fields or k in req.metadata_fields)},
+            metadata=h.metadata or {},
             snippet=h.snippet,
         )
         for h in vhits.hits
     ]
 
     took_ms = int((time.perf_counter_ns() - t0) / 1_000_000)
-    return SearchResponse(
-        query_id=str(uuid.uuid4()),
+    return SearchResponse.model_construct(
+        query_id=new_id(),
         took_ms=took_ms,
         total=vhits.total,
         hits=hits,
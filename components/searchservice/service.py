@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import logging
-import uuid
 from typing import Optional
 
 from fastapi import APIRouter, Depends, Header, HTTPException, status
@@ -11,8 +10,9 @@ from pydantic import BaseModel
 from .contracts import (
     EmbeddingAdapterPort,
     SearchRequest,
+    SearchResponse,
 )
-from .core import execute_search
+from .core import execute_search, new_id
 from .adapters_inmemory import (
     InMemoryEmbeddingAdapter,
     InMemoryVectorStoreAdapter,
@@ -61,13 +61,15 @@ async def health(container: Container = Depends(get_container)):
         raise HTTPException(status_code=500, detail="unhealthy")
 
 
-@router.post("", response_model=None)
+# FastAPI serializes the returned SearchResponse straight to JSON via pydantic;
+# no intermediate dict / jsonable_encoder pass.
+@router.post("", response_model=SearchResponse)
 async def post_search(
     payload: SearchRequest,
     tenant_id: str = Depends(get_tenant_id),
     container: Container = Depends(get_container),
 ):
-    request_id = str(uuid.uuid4())
+    request_id = new_id()
     logger.info(
         "search.request start request_id=%s tenant=%s top_k=%s type=%s",
         request_id, tenant_id, payload.top_k, payload.search_type,
@@ -84,7 +86,7 @@ async def post_search(
             "search.request end request_id=%s tenant=%s took_ms=%s total=%s",
             request_id, tenant_id, resp.took_ms, resp.total
         )
-        return resp.dict()
+        return resp
     except HTTPException:
         raise
     except Exception as e:
@@ -1,8 +1,15 @@
 from __future__ import annotations
 
+import heapq
 import math
+import operator
 import time
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover
+    np = None
 
 from ..errors import BadRequest, NamespaceNotFound
 from ..models import (
@@ -18,59 +25,128 @@ from ..models import (
 )
 
 
-def _cosine(a: List[float], b: List[float]) -> float:
+def _l2_norm(v: List[float]) -> float:
+    return math.sqrt(sum(x * x for x in v))
+
+
+def _cosine(a: List[float], na: float, b: List[float], nb: float) -> float:
     if len(a) != len(b):
         raise BadRequest("query vector dimensionality mismatch")
-    dot = sum(x * y for x, y in zip(a, b))
-    na = math.sqrt(sum(x * x for x in a))
-    nb = math.sqrt(sum(y * y for y in b))
     if na == 0.0 or nb == 0.0:
         return 0.0
+    dot = sum(x * y for x, y in zip(a, b))
     return dot / (na * nb)
 
 
-def _eval_condition(md: dict, c: FilterCondition) -> bool:
-    exists = c.field in md
-    val = md.get(c.field)
+_ORDER_OPS = {"gt": operator.gt, "gte": operator.ge, "lt": operator.lt, "lte": operator.le}
+
+
+def _compile_condition(c: FilterCondition) -> Callable[[dict], bool]:
+    """Resolve one condition's op once; the returned closure only compares."""
+    field, value = c.field, c.value
     if c.op == "exists":
-        return exists
+        return lambda md: field in md
     if c.op == "eq":
-        return val == c.value
+        return lambda md: md.get(field) == value
     if c.op == "neq":
-        return val != c.value
-    if c.op == "gt":
-        return exists and val > c.value
-    if c.op == "gte":
-        return exists and val >= c.value
-    if c.op == "lt":
-        return exists and val < c.value
-    if c.op == "lte":
-        return exists and val <= c.value
+        return lambda md: md.get(field) != value
+    if c.op in _ORDER_OPS:
+        cmp = _ORDER_OPS[c.op]
+        return lambda md: field in md and cmp(md[field], value)
     if c.op == "in":
-        return exists and val in (c.value or [])
+        members = value or []
+        return lambda md: field in md and md[field] in members
     if c.op == "nin":
-        return not exists or val not in (c.value or [])
-    return False
+        members = value or []
+        return lambda md: field not in md or md[field] not in members
+    return lambda md: False
 
 
-def _match_filter(md: dict, flt: Optional[DNFFilter]) -> bool:
+def _compile_filter(flt: Optional[DNFFilter]) -> Optional[Callable[[dict], bool]]:
+    """
+    Compile a DNF filter into a metadata predicate once per call instead of
+    re-dispatching every condition per record. None means "match all".
+    """
     if not flt or not flt.groups:
-        return True
-    # DNF: any AND group satisfied -> pass
-    for and_group in flt.groups:
-        if all(_eval_condition(md, c) for c in and_group):
-            return True
-    return False
+        return None
+    groups = [[_compile_condition(c) for c in and_group] for and_group in flt.groups]
+
+    def match(md: dict) -> bool:
+        # DNF: any AND group satisfied -> pass
+        for and_group in groups:
+            if all(p(md) for p in and_group):
+                return True
+        return False
+    return match
+
+
+def _top_k(scores, k: int):
+    """
+    Indices of the k highest scores, best first, in O(N + k log k).
+    Ties keep index order (same result as a stable descending sort).
+    """
+    n = len(scores)
+    if k >= n:
+        return np.argsort(-scores, kind="stable")
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    kth = np.partition(scores, n - k)[n - k]
+    above = np.flatnonzero(scores > kth)
+    ties = np.flatnonzero(scores == kth)[: k - len(above)]
+    idx = np.concatenate((above, ties))
+    return idx[np.lexsort((idx, -scores[idx]))]
+
+
+# 4096 rows x 16 dims x 4 B = 256 KiB per tile: the tile and its scores stay L2-resident
+_BLOCK_ROWS = 4096
+
+
+def _blocked_top_k(score_rows: Callable[[int, int], Any], n: int, k: int):
+    """
+    Top-k over n rows scored tile by tile; score_rows(start, stop) returns the
+    scores of rows [start, stop). Only k candidates survive each tile, so the
+    full score vector is never materialised. Returns (positions, scores), best
+    first, with the same tie order as _top_k.
+    """
+    if n <= _BLOCK_ROWS:
+        scores = score_rows(0, n)
+        idx = _top_k(scores, k)
+        return idx, scores[idx]
+    cand_idx = np.empty(0, dtype=np.intp)
+    cand_scores = np.empty(0, dtype=np.float32)
+    for start in range(0, n, _BLOCK_ROWS):
+        s = score_rows(start, min(n, start + _BLOCK_ROWS))
+        sel = _top_k(s, k)
+        cand_idx = np.concatenate((cand_idx, sel + start))
+        cand_scores = np.concatenate((cand_scores, s[sel]))
+        keep = np.lexsort((cand_idx, -cand_scores))[:k]
+        cand_idx, cand_scores = cand_idx[keep], cand_scores[keep]
+    return cand_idx, cand_scores
+
+
+def _unit_f32(vector: List[float]):
+    """Query as a fresh contiguous float32 unit vector (zero stays zero), so
+    `matrix @ q` hits BLAS sgemv directly with no dtype casts or copies."""
+    q = np.array(vector, dtype=np.float32)
+    n = np.linalg.norm(q)
+    if n:
+        q /= n
+    return q
 
 
 class InMemoryVectorStore:
     """
     Simple, deterministic, test-friendly adapter.
     Storage: { namespace: { id: VectorRecord } }
+
+    With numpy available, each namespace's vectors are stacked into an
+    L2-normalised float32 matrix on first query and dropped on any write.
     """
 
     def __init__(self) -> None:
         self._store: Dict[str, Dict[str, VectorRecord]] = {}
+        # namespace -> (records, normalised matrix), or None when dims are mixed
+        self._matrices: Dict[str, Optional[Tuple[List[VectorRecord], Any]]] = {}
 
     # -------- Port methods --------
 
@@ -79,8 +155,10 @@ class InMemoryVectorStore:
         if not namespace:
             raise BadRequest("namespace required")
         ns = self._store.setdefault(namespace, {})
+        self._matrices.pop(namespace, None)
         for r in records:
             # Pydantic already validated r
+            r._norm_cache = _l2_norm(r.vector)
             ns[r.id] = r
         dt = (time.perf_counter() - t0) * 1000
         # Simple observability
@@ -99,25 +177,79 @@ class InMemoryVectorStore:
         ns = self._store.get(namespace)
         if ns is None:
             raise NamespaceNotFound(f"namespace={namespace}")
-        scored: List[QueryMatch] = []
+        if np is not None:
+            built = self._matrix_for(namespace, ns)
+            if built is not None:
+                return self._query_matrix(namespace, built, vector, top_k, flt)
+        scored: List[Tuple[float, VectorRecord]] = []
+        q_norm = _l2_norm(vector)
+        match = _compile_filter(flt)
         for rec in ns.values():
-            if not _match_filter(rec.metadata, flt):
+            if match is not None and not match(rec.metadata):
                 continue
-            score = _cosine(vector, rec.vector)
-            scored.append(
+            scored.append((_cosine(vector, q_norm, rec.vector, rec._norm_cache), rec))
+        # selection, not a full sort (nlargest keeps sorted()'s tie order);
+        # QueryMatch is only built for the survivors
+        top = heapq.nlargest(max(0, top_k), scored, key=operator.itemgetter(0))
+        out = QueryResult(
+            namespace=namespace,
+            matches=[
                 QueryMatch(
                     id=rec.id,
                     score=score,
                     metadata=rec.metadata,
                     text=rec.text,
                 )
-            )
-        scored.sort(key=lambda m: m.score, reverse=True)
-        out = QueryResult(namespace=namespace, matches=scored[: max(0, top_k)])
+                for score, rec in top
+            ],
+        )
         dt = (time.perf_counter() - t0) * 1000
         # print(f"[InMemoryVectorStore] query ns={namespace} top_k={top_k} ms={dt:.2f}")
         return out
 
+    def _matrix_for(self, namespace: str, ns: Dict[str, VectorRecord]):
+        if namespace not in self._matrices:
+            recs = list(ns.values())
+            built = None
+            if recs and len({len(r.vector) for r in recs}) == 1:
+                m = np.array([r.vector for r in recs], dtype=np.float32)
+                norms = np.linalg.norm(m, axis=1, keepdims=True)
+                built = (recs, np.ascontiguousarray(m / np.where(norms == 0, 1, norms), dtype=np.float32))
+            self._matrices[namespace] = built
+        return self._matrices[namespace]
+
+    def _query_matrix(
+        self,
+        namespace: str,
+        built: Tuple[List[VectorRecord], Any],
+        vector: List[float],
+        top_k: int,
+        flt: Optional[DNFFilter],
+    ) -> QueryResult:
+        recs, matrix = built
+        match = _compile_filter(flt)
+        if match is None:
+            rows = range(len(recs))
+        else:
+            rows = [i for i, rec in enumerate(recs) if match(rec.metadata)]
+            if not rows:
+                return QueryResult(namespace=namespace, matches=[])
+        if len(vector) != matrix.shape[1]:
+            raise BadRequest("query vector dimensionality mismatch")
+        q = _unit_f32(vector)
+
+        def score_rows(start: int, stop: int):
+            if match is None:
+                return matrix[start:stop] @ q  # contiguous view, no gather
+            return matrix[rows[start:stop]] @ q
+
+        pos, scores = _blocked_top_k(score_rows, len(rows), top_k)
+        matches = []
+        for j, score in zip(pos, scores):
+            rec = recs[rows[j]]
+            matches.append(QueryMatch(id=rec.id, score=float(score), metadata=rec.metadata, text=rec.text))
+        return QueryResult(namespace=namespace, matches=matches)
+
     def fetch(self, namespace: str, ids: List[str]) -> FetchResult:
         ns = self._store.get(namespace)
         if ns is None:
@@ -134,6 +266,7 @@ class InMemoryVectorStore:
         ns = self._store.get(namespace)
         if ns is None:
             raise NamespaceNotFound(f"namespace={namespace}")
+        self._matrices.pop(namespace, None)
         deleted = 0
         if ids:
             for i in ids:
@@ -141,7 +274,8 @@ class InMemoryVectorStore:
                     del ns[i]
                     deleted += 1
         elif flt:
-            to_del = [rid for rid, rec in ns.items() if _match_filter(rec.metadata, flt)]
+            match = _compile_filter(flt)
+            to_del = [rid for rid, rec in ns.items() if match is None or match(rec.metadata)]
             for rid in to_del:
                 del ns[rid]
                 deleted += 1
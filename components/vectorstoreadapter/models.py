@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 from typing import Any, Dict, List, Literal, Optional
-from pydantic import BaseModel, Field, conlist, validator
+from pydantic import BaseModel, Field, PrivateAttr, conlist, validator
 
 
 # -------- Input / Filter Contracts --------
@@ -28,6 +29,8 @@ class VectorRecord(BaseModel):
     text: Optional[str] = None
     document_id: Optional[str] = None
     chunk_id: Optional[str] = None
+    # L2 norm of `vector`, filled in by InMemoryVectorStore.upsert
+    _norm_cache: Optional[float] = PrivateAttr(default=None)
 
     @validator("vector")
     def no_nan_inf(cls, v: List[float]) -> List[float]:
@@ -38,36 +41,44 @@ class VectorRecord(BaseModel):
 
 
 # -------- Result Contracts --------
+# Results are built by adapters from already-validated records, so they are
+# plain slotted dataclasses: no per-match validation on the query hot path.
 
-class UpsertResult(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class UpsertResult:
     upserted_count: int
     namespace: Optional[str] = None
 
 
-class QueryMatch(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class QueryMatch:
     id: str
     score: float
-    metadata: Dict[str, Any] = Field(default_factory=dict)
+    metadata: Dict[str, Any] = field(default_factory=dict)
     text: Optional[str] = None
 
 
-class QueryResult(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class QueryResult:
     namespace: Optional[str] = None
-    matches: List[QueryMatch] = Field(default_factory=list)
+    matches: List[QueryMatch] = field(default_factory=list)
 
 
-class FetchResult(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class FetchResult:
     namespace: Optional[str] = None
-    records: Dict[str, VectorRecord] = Field(default_factory=dict)
+    records: Dict[str, VectorRecord] = field(default_factory=dict)
 
 
-class DeleteResult(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class DeleteResult:
     namespace: Optional[str] = None
     deleted_count: int
 
 
-class StatsResult(BaseModel):
-    namespaces: Dict[str, Dict[str, int]] = Field(default_factory=dict)
+@dataclass(slots=True, frozen=True, kw_only=True)
+class StatsResult:
+    namespaces: Dict[str, Dict[str, int]] = field(default_factory=dict)
     # Example: { "tenantA__default": {"vector_count": 123} }
 
 ---
@@ -21,47 +21,61 @@ Usage examples:
   python md_generator.py docs/*.md --dry-run --debug
   python md_generator.py spec.md --marker "@file" --marker-scan-lines 999
   python md_generator.py spec.md --lang python --overwrite
+  python md_generator.py "docs/**/*.md" --jobs 4
 """
 
-import argparse
+import contextlib
+import functools
+import glob
+import io
+import mmap
 import os
 import re
+import stat
 import sys
 from pathlib import Path
-from typing import Optional, Tuple, List, Set
+from typing import TYPE_CHECKING, Optional, Tuple, List, Set, Sequence
+
+if TYPE_CHECKING:
+    import argparse
 
 # ---------------------------
 # Parsing config / regexes
 # ---------------------------
 
-# Robust fenced blocks: allow 3+ backticks/ tildes, up to 3 spaces indent
-FENCE_RE = re.compile(
-    r"(?:^|\n)"                         # start or newline
-    r"(?P<indent>[ \t]{0,3})"           # up to 3 spaces indent
-    r"(?P<fence>```+|~~~+)[ \t]*"       # 3+ backticks or tildes
-    r"(?P<info>[^\n]*)\n"               # info string (language, etc.)
-    r"(?P<body>.*?)(?:\n)"              # body (non-greedy)
-    r"(?P=indent)(?P=fence)[ \t]*"      # closing fence with same indent/char/len
-    r"(?=\n|$)",                        # followed by newline or end
-    re.DOTALL
+# Robust fenced blocks: allow 3+ backticks/ tildes, up to 3 spaces indent.
+# The opening line is '<indent><fence>[info]'; the block closes at the first
+# later line that is exactly '<indent><fence>' plus trailing blanks (same
+# indent, char and length), with at least one body line in between.
+FENCE_OPENERS = ("```", "~~~")
+
+LINE_COMMENT_MARKERS = (
+    "#", "//", "--", ";", "%", "'", "!", "REM ", "rem ", "::"
 )
+# Markers bucketed by first char (longest first): one dict lookup rejects most
+# lines, and a hit usually leaves a single startswith() to confirm.
+_MARKERS_BY_FIRST_CHAR = {
+    c: tuple(sorted((mk for mk in LINE_COMMENT_MARKERS if mk[0] == c), key=len, reverse=True))
+    for c in {mk[0] for mk in LINE_COMMENT_MARKERS}
+}
 
-LINE_COMMENT_MARKERS = [
-    "#", "//", ";", "--", "%", "'", "!", "REM ", "rem ", "::"
-]
-WRAPPED_COMMENT_PATTERNS = [
-    (r"^<!--\s*(?P<inner>.+?)\s*-->$",),
-    (r"^/\*\s*(?P<inner>.+?)\s*\*/$",),
-    (r"^\(\*\s*(?P<inner>.+?)\s*\*\)$",),
-]
+# <!-- x -->, /* x */ and (* x *) fused into one anchored alternation: a single
+# match() per line, with the comment style's inner text in m.lastgroup.
+WRAPPED_COMMENT_RE = re.compile(
+    r"^(?:<!--\s*(?P<html>.+?)\s*-->"
+    r"|/\*\s*(?P<c>.+?)\s*\*/"
+    r"|\(\*\s*(?P<ml>.+?)\s*\*\))$"
+)
+# Last-resort bare relative path: no leading slash, no spaces, has a dot/slash,
+# sane last char
+BARE_PATH_RE = re.compile(r"^(?![\\/])(?!.* )(?=.*[./\\]).+[A-Za-z0-9_\-./\\]$")
 
 # Hex header for "filestart"
 FILESTART_HEX = "66696c657374617274"
-HEX_HEADER_RE = re.compile(rf"^[ \t]*{FILESTART_HEX}[ \t]+(?P<path>\S+)[ \t]*$", re.MULTILINE)
 HEX_PREFIX_RE = re.compile(rf"^\s*{FILESTART_HEX}\s+(?P<rest>.+)$")
 
 # Lines commonly injected by copy-paste from UIs
-NOISE_SINGLE_LINES = {
+NOISE_SINGLE_LINES = frozenset({
     "Copy code", "copy code",
     "python", "py",
     "ts", "tsx",
@@ -71,16 +85,30 @@ NOISE_SINGLE_LINES = {
     "json", "toml", "yaml", "yml",
     "sql", "go", "rust", "cpp", "c", "cs", "java", "kotlin", "swift",
     "powershell", "ps1",
-}
+})
+# Everything _clean_stream_block drops: UI noise plus stray bare fence lines
+_STREAM_DROP_LINES = NOISE_SINGLE_LINES | {"```", "~~~"}
+
+# Head span checked with str.find before the per-line marker scan
+MARKER_PREFILTER_SPAN = 4096
 
-INVALID_WIN_CHARS = set('<>:"|?*')  # path component invalids on Windows
+# Line boundaries str.splitlines() honours besides "\n"; bodies containing any
+# of them take the splitlines-based path so line semantics stay unchanged
+OTHER_LINE_BREAK_RE = re.compile("[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+
+INVALID_WIN_CHARS = frozenset('<>:"|?*')  # path component invalids on Windows
+
+# "**name**" left behind when markdown bold is copied as literal text
+MD_EMPHASIS_RE = re.compile(r"\*\*([A-Za-z0-9_.-]+)\*\*")
 
 
 # ---------------------------
 # CLI
 # ---------------------------
 
-def parse_args() -> argparse.Namespace:
+def parse_args() -> "argparse.Namespace":
+    import argparse  # deferred: only the CLI entry point needs it
+
     p = argparse.ArgumentParser(description="Extract files from hex-stream or fenced code blocks.")
     p.add_argument("inputs", nargs="+", help="Input files (supports glob patterns)")
     p.add_argument("--base-dir", default=".", help="Base output directory (default: .)")
@@ -92,6 +120,9 @@ def parse_args() -> argparse.Namespace:
     p.add_argument("--marker", default="*&^file", help="Comment marker token searched near top of fenced blocks (default: '*&^file')")
     p.add_argument("--marker-scan-lines", type=int, default=10, help="Top N lines to scan for the marker (default: 10)")
     p.add_argument("--debug", action="store_true", help="Verbose debug output to stderr")
+    p.add_argument("--jobs", type=int, default=1,
+                   help="Process input files in N worker processes (default: 1). Inputs that "
+                        "share an output path are processed sequentially.")
     return p.parse_args()
 
 
@@ -100,7 +131,9 @@ def parse_args() -> argparse.Namespace:
 # ---------------------------
 
 def _strip_invisibles(s: str) -> str:
-    # remove common zero-width / BOM / word-joiner chars
+    # remove common zero-width / BOM / word-joiner chars (none of them is ASCII)
+    if s.isascii():
+        return s.strip()
     return (
         s.replace("\u200b", "")
          .replace("\u200c", "")
@@ -125,9 +158,9 @@ def sanitize_dest_path(dest: str, fix_md_emphasis: bool = True) -> str:
     if s in {"-", "–", "—", "*"}:
         raise ValueError(f"Rejected non-path token {dest!r}")
 
-    if fix_md_emphasis:
+    if fix_md_emphasis and "**" in s:
         # "**init**.py" -> "__init__.py", and "**dir**/file" -> "__dir__/file"
-        s = re.sub(r"\*\*([A-Za-z0-9_.-]+)\*\*", r"__\1__", s)
+        s = MD_EMPHASIS_RE.sub(r"__\1__", s)
 
     # Undo markdown-style escaped underscores inside names (warning-free)
     s = s.replace("\\_", "_")
@@ -138,74 +171,141 @@ def sanitize_dest_path(dest: str, fix_md_emphasis: bool = True) -> str:
     # Remove empty elements, '.' current-dir elements
     parts = [p for p in s.split("/") if p not in ("", ".")]
 
-    # Validate components
-    for p in parts:
-        bad = INVALID_WIN_CHARS.intersection(p)
-        if bad:
-            raise ValueError(
-                f"Invalid character(s) {''.join(sorted(bad))!r} in path component {p!r} derived from {dest!r}."
-            )
-
     # Reconstruct
     cleaned = "/".join(parts)
+
+    # Validate components ('/' is not an invalid char, so check the whole path first)
+    if not INVALID_WIN_CHARS.isdisjoint(cleaned):
+        for p in parts:
+            bad = INVALID_WIN_CHARS.intersection(p)
+            if bad:
+                raise ValueError(
+                    f"Invalid character(s) {''.join(sorted(bad))!r} in path component {p!r} derived from {dest!r}."
+                )
+
     if not cleaned:
         raise ValueError(f"Empty/invalid destination path derived from {dest!r}.")
     return cleaned
 
 
-def _strip_win_longprefix(p: Path) -> Path:
-    s = str(p)
+def _strip_win_longprefix(s: str) -> str:
     if s.startswith("\\\\?\\"):
         s = s[4:]
-    return Path(s)
+    return s
 
-def _is_within_base(base: Path, target: Path) -> bool:
+def _is_within_base(base_resolved: str, target_resolved: str) -> bool:
     """
-    Reliable, prefix-insensitive containment check:
-    try target.relative_to(base) after stripping any Windows long-path prefix.
+    Reliable, prefix-insensitive containment check on two already-resolved paths:
+    target equals base or lies under base + separator, compared after stripping
+    any Windows long-path prefix and case-folding where the OS does.
     """
-    b = _strip_win_longprefix(base.resolve())
-    t = _strip_win_longprefix(target.resolve())
-    try:
-        t.relative_to(b)
-        return True
-    except Exception:
-        return False
+    b = os.path.normcase(_strip_win_longprefix(base_resolved))
+    t = os.path.normcase(_strip_win_longprefix(target_resolved))
+    return t == b or t.startswith(b if b.endswith(os.sep) else b + os.sep)
 
-def safe_join(base: Path, rel: str, allow_outside: bool) -> Path:
-    target = (base / rel).resolve()
-    if not allow_outside and not _is_within_base(base, target):
-        raise ValueError(f"Refusing to write outside base dir: {target} (base: {base.resolve()})")
+def safe_join(base_resolved: str, rel: str, allow_outside: bool) -> str:
+    """
+    Join `rel` onto `base_resolved` (the caller resolves the base once per
+    document) and refuse the result if it escapes the base. Works on plain
+    strings; realpath() still follows symlinks like Path.resolve() does.
+    """
+    target = os.path.realpath(os.path.join(base_resolved, rel))
+    if not allow_outside and not _is_within_base(base_resolved, target):
+        raise ValueError(f"Refusing to write outside base dir: {target} (base: {base_resolved})")
     return target
 
 
+def _ensure_parent(out_path: str, created_dirs: Set[str]) -> None:
+    """mkdir -p the parent of `out_path`, skipping directories already made for this document."""
+    parent = os.path.dirname(out_path)
+    if parent not in created_dirs:
+        os.makedirs(parent, exist_ok=True)
+        created_dirs.add(parent)
+
+def _write_text(out_path: str, text: str, encoding: str) -> None:
+    with open(out_path, "w", encoding=encoding) as f:
+        f.write(text)
+
+
 # ---------------------------
 # Fenced block helpers
 # ---------------------------
 
+def _find_closing_fence(md: str, pos: int, fence: str) -> int:
+    """Start of the first line at/after `pos` that is exactly `fence` plus blanks, or -1."""
+    needle = "\n" + fence
+    while True:
+        q = md.find(needle, pos - 1)
+        if q < 0:
+            return -1
+        tail_start = q + len(needle)
+        nl = md.find("\n", tail_start)
+        if not md[tail_start:nl if nl >= 0 else len(md)].strip(" \t"):
+            return q + 1
+        pos = q + 2
+
 def iter_code_blocks(markdown: str):
-    for m in FENCE_RE.finditer(markdown):
-        info = (m.group("info") or "").strip()
+    """
+    Line-oriented scan yielding (lang, body, offset) per fenced block. Only
+    lines containing a fence run are looked at, found with str.find. An opener
+    whose run is longer than any closer retries with shorter fences (the extra
+    chars then lead the info string); an opener that never closes is plain text.
+    """
+    md = markdown
+    unclosed: Set[str] = set()  # fences with no closer left anywhere below
+    pos = 0  # always the start of a line
+    while True:
+        bt = md.find("```", pos)
+        tl = md.find("~~~", pos)
+        hit = tl if bt < 0 or 0 <= tl < bt else bt
+        if hit < 0:
+            return
+        start = md.rfind("\n", 0, hit) + 1
+        eol = md.find("\n", hit)
+        if eol < 0:
+            return  # an opener needs a newline after its info string
+        pos = eol + 1
+        line = md[start:eol]
+        stripped = line.lstrip(" \t")
+        if not stripped.startswith(FENCE_OPENERS) or len(line) - len(stripped) > 3:
+            continue
+        # the closer must come after at least one body line
+        first_body_end = md.find("\n", pos)
+        if first_body_end < 0:
+            continue
+        indent = line[:len(line) - len(stripped)]
+        ch = stripped[0]
+        close = -1
+        for n in range(len(stripped) - len(stripped.lstrip(ch)), 2, -1):
+            fence = indent + ch * n
+            if fence in unclosed:
+                continue
+            close = _find_closing_fence(md, first_body_end + 1, fence)
+            if close >= 0:
+                break
+            unclosed.add(fence)
+        if close < 0:
+            continue
+        info = stripped[n:].strip()
         lang = info.split()[0] if info else None
-        yield (lang, m.group("body"), m.start())
+        # offset: the newline preceding the opener (0 when it is the first line)
+        yield (lang, md[pos:close - 1], start - 1 if start else 0)
+        close_eol = md.find("\n", close)
+        if close_eol < 0:
+            return
+        pos = close_eol + 1
 
 def _strip_wrapped_comment(line: str) -> Optional[str]:
-    for (pattern,) in WRAPPED_COMMENT_PATTERNS:
-        m = re.match(pattern, line.strip())
-        if m:
-            return m.group("inner").strip()
-    return None
+    m = WRAPPED_COMMENT_RE.match(line.strip())
+    return m.group(m.lastgroup).strip() if m else None
 
 def _strip_line_comment_prefix(line: str) -> Optional[str]:
     s = line.lstrip()
-    for mk in LINE_COMMENT_MARKERS:
+    for mk in _MARKERS_BY_FIRST_CHAR.get(s[:1], ()):
         if s.startswith(mk):
             return s[len(mk):].strip()
     return None
 
-def _looks_like_comment(line: str) -> bool:
-    return _strip_line_comment_prefix(line) is not None or _strip_wrapped_comment(line) is not None
-
 def _extract_after_marker(s: str, marker: str) -> Optional[str]:
     idx = s.find(marker)
     if idx < 0:
@@ -222,49 +322,107 @@ def _strip_embedded_hex_prefix(line: str) -> str:
     m = HEX_PREFIX_RE.match(line)
     return m.group("rest") if m else line
 
-def extract_path_from_marker(lines: List[str], marker: str, max_scan: int) -> Optional[Tuple[str, int]]:
-    scan_limit = min(max_scan, len(lines))
-    for i in range(scan_limit):
-        raw = lines[i]
-        # Try wrapped comments
-        inner = _strip_wrapped_comment(raw)
-        if inner is not None:
-            p = _extract_after_marker(inner, marker)
-            if p:
-                return (_strip_embedded_hex_prefix(p), i)
-        # Try line comments
-        tail = _strip_line_comment_prefix(raw)
-        if tail is not None:
-            p = _extract_after_marker(tail, marker)
-            if p:
-                return (_strip_embedded_hex_prefix(p), i)
-        # Stop early once real code starts
-        if raw.strip() and not _looks_like_comment(raw):
+def _marker_line_path(raw: str, marker: str) -> Tuple[Optional[str], bool]:
+    """(path after `marker` or None, whether the scan may continue past `raw`)."""
+    # Try wrapped comments
+    inner = _strip_wrapped_comment(raw)
+    if inner is not None:
+        p = _extract_after_marker(inner, marker)
+        if p:
+            return _strip_embedded_hex_prefix(p), True
+    # Try line comments
+    tail = _strip_line_comment_prefix(raw)
+    if tail is not None:
+        p = _extract_after_marker(tail, marker)
+        if p:
+            return _strip_embedded_hex_prefix(p), True
+    # Stop early once real code starts (reusing the two comment checks above)
+    return None, inner is not None or tail is not None or not raw.strip()
+
+def _marker_path_in_lines(lines: List[str], marker: str, max_scan: int) -> Optional[Tuple[str, int]]:
+    """splitlines() counterpart of extract_path_from_marker: (path, line index) or None."""
+    for i, raw in enumerate(lines[:max_scan]):
+        path, more = _marker_line_path(raw, marker)
+        if path:
+            return path, i
+        if not more:
             break
     return None
 
-def split_first_line(body: str) -> Tuple[str, str]:
-    lines = body.splitlines()
+def extract_path_from_marker(body: str, marker: str, max_scan: int) -> Optional[Tuple[str, int, int]]:
+    """
+    Look for `marker` in the comment lines at the top of `body` (at most
+    `max_scan` lines, read with str.find so the rest of the body is never
+    split). Returns (path, line_start, line_end) where body[line_start:line_end]
+    is the marker line including its newline, or None.
+
+    Lines are "\n"-terminated only; callers route bodies matching
+    OTHER_LINE_BREAK_RE through _marker_path_in_lines instead.
+    """
+    # Prefilter: a hit needs `marker` inside one of the scanned lines. If it is
+    # absent from the head span and that span already holds all `max_scan`
+    # lines (or the whole body), no line can match, so skip the line scan.
+    span = MARKER_PREFILTER_SPAN
+    if body.find(marker, 0, span) < 0 and (
+        len(body) <= span or body.count("\n", 0, span) >= max_scan
+    ):
+        return None
+    pos = 0
+    end = len(body)
+    for _ in range(max_scan):
+        if pos >= end:
+            break
+        nl = body.find("\n", pos)
+        start = pos
+        raw = body[start:nl if nl >= 0 else end]
+        pos = end if nl < 0 else nl + 1
+        path, more = _marker_line_path(raw, marker)
+        if path:
+            return (path, start, pos)
+        if not more:
+            break
+    return None
+
+def _split_first_of_lines(lines: List[str], body: str) -> Tuple[str, str]:
     i = 0
     while i < len(lines) and lines[i].strip() == "":
         i += 1
     if i >= len(lines):
         return ("", "")
-    first = lines[i]
     rest = "\n".join(lines[i+1:]) + ("\n" if body.endswith("\n") else "")
-    return (first, rest)
+    return (lines[i], rest)
+
+def split_first_line(body: str) -> Tuple[str, str]:
+    """
+    Return (first non-blank line, everything after it) as slices of `body`,
+    walking newlines with str.find instead of splitting the whole body.
+    Bodies with other splitlines() boundaries are split the old way.
+    """
+    if OTHER_LINE_BREAK_RE.search(body):
+        return _split_first_of_lines(body.splitlines(), body)
+    pos = 0
+    end = len(body)
+    while pos < end:
+        nl = body.find("\n", pos)
+        if nl < 0:
+            first = body[pos:]
+            return (first, "") if first.strip() else ("", "")
+        if body[pos:nl].strip():
+            # a body ending right after the first line keeps that newline
+            return (body[pos:nl], body[nl + 1:] or "\n")
+        pos = nl + 1
+    return ("", "")
 
 def extract_path_from_first_line(first_line: str) -> Optional[str]:
     line = _strip_embedded_hex_prefix(first_line.strip())
-    for (pattern,) in WRAPPED_COMMENT_PATTERNS:
-        m = re.match(pattern, line)
-        if m:
-            return m.group("inner").strip()
-    for mk in LINE_COMMENT_MARKERS:
-        if line.startswith(mk):
-            return line[len(mk):].strip()
+    m = WRAPPED_COMMENT_RE.match(line)
+    if m:
+        return m.group(m.lastgroup).strip()
+    tail = _strip_line_comment_prefix(line)
+    if tail is not None:
+        return tail
     # last resort: accept *reasonable* bare relative paths (no spaces, has dot/slash)
-    if re.match(r"^(?![\\/])(?=.*[./\\]).+[A-Za-z0-9_\-./\\]$", line) and " " not in line:
+    if BARE_PATH_RE.match(line):
         return line
     return None
 
@@ -274,45 +432,67 @@ def extract_path_from_first_line(first_line: str) -> Optional[str]:
 # ---------------------------
 
 def _clean_stream_block(text: str) -> str:
-    lines = text.splitlines()
-    out = []
-    for ln in lines:
-        s = ln.strip()
-        if s in NOISE_SINGLE_LINES:
-            continue
-        if s in ("```", "~~~"):
+    out = [ln for ln in text.splitlines() if ln.strip() not in _STREAM_DROP_LINES]
+    # trim surrounding blank lines (nice-to-have); slice once instead of pop(0)
+    lo, hi = 0, len(out)
+    while lo < hi and not out[lo].strip():
+        lo += 1
+    while hi > lo and not out[hi - 1].strip():
+        hi -= 1
+    return ("\n".join(out[lo:hi]) + ("\n" if text.endswith("\n") else ""))
+
+def iter_hex_headers(md: str):
+    """
+    Yield (path, header_start, header_end) for each hex "filestart" header: a
+    line holding only blanks, the filestart token, blanks, one path token and
+    optional trailing blanks. Candidates are found with str.find on the token.
+    """
+    pos = 0
+    n = len(FILESTART_HEX)
+    while True:
+        hit = md.find(FILESTART_HEX, pos)
+        if hit < 0:
+            return
+        start = md.rfind("\n", 0, hit) + 1
+        eol = md.find("\n", hit)
+        if eol < 0:
+            eol = len(md)
+        pos = eol + 1  # any later hit on this line has a non-blank prefix
+        rest = md[hit + n:eol]
+        if rest[:1] not in (" ", "\t") or md[start:hit].strip(" \t"):
             continue
-        out.append(ln)
-    # trim surrounding blank lines (nice-to-have)
-    while out and out[0].strip() == "":
-        out.pop(0)
-    while out and out[-1].strip() == "":
-        out.pop()
-    return ("\n".join(out) + ("\n" if text.endswith("\n") else ""))
+        path = rest.strip(" \t")
+        if path and path.split() == [path]:
+            yield (path, start, eol)
 
 def process_hex_stream(md: str, base_dir: Path, allow_outside: bool, overwrite: bool,
                        dry_run: bool, encoding: str, debug: bool,
-                       already_written: Set[Path]) -> Tuple[int, int, int]:
+                       already_written: Set[str],
+                       headers: Optional[Sequence[Tuple[str, int, int]]] = None,
+                       created_dirs: Optional[Set[str]] = None,
+                       base_resolved: Optional[str] = None) -> Tuple[int, int, int]:
     wrote = skipped = errored = 0
-    matches = list(HEX_HEADER_RE.finditer(md))
-    for idx, m in enumerate(matches):
-        dest_raw = m.group("path")
-        start = m.end()
-        end = matches[idx+1].start() if idx + 1 < len(matches) else len(md)
+    created_dirs = set() if created_dirs is None else created_dirs
+    if base_resolved is None:
+        base_resolved = os.path.realpath(base_dir)
+    matches = list(iter_hex_headers(md)) if headers is None else headers
+    for idx, (dest_raw, _, start) in enumerate(matches):
+        end = matches[idx+1][1] if idx + 1 < len(matches) else len(md)
         body_raw = md[start:end]
         body = _clean_stream_block(body_raw)
 
         try:
             dest = sanitize_dest_path(dest_raw)
-            out_path = safe_join(base_dir, dest, allow_outside)
+            out_path = safe_join(base_resolved, dest, allow_outside)
 
-            if out_path in already_written:
+            out_key = os.path.normcase(out_path)
+            if out_key in already_written:
                 if debug:
                     print(f"[skip-dup] {out_path}", file=sys.stderr)
                 skipped += 1
                 continue
 
-            if out_path.exists() and not overwrite:
+            if not overwrite and os.path.exists(out_path):
                 print(f"[skip] {out_path} exists (use --overwrite)", file=sys.stderr)
                 skipped += 1
                 continue
@@ -320,11 +500,11 @@ def process_hex_stream(md: str, base_dir: Path, allow_outside: bool, overwrite:
             if dry_run:
                 print(f"[dry-run] Would write {out_path} ({len(body)} bytes)")
             else:
-                out_path.parent.mkdir(parents=True, exist_ok=True)
-                out_path.write_text(body, encoding=encoding)
+                _ensure_parent(out_path, created_dirs)
+                _write_text(out_path, body, encoding)
                 print(f"[write] {out_path} ({len(body)} bytes)")
             wrote += 1
-            already_written.add(out_path)
+            already_written.add(out_key)
 
         except Exception as e:
             errored += 1
@@ -341,43 +521,73 @@ def process_hex_stream(md: str, base_dir: Path, allow_outside: bool, overwrite:
 # Fenced mode
 # ---------------------------
 
-def is_allowed_lang(lang: Optional[str], allowed: List[str]) -> bool:
-    if not allowed:
+LANG_ALIASES = {
+    "py": "python",
+    "ts": "typescript",
+    "js": "javascript",
+    "sh": "bash",
+    "ps1": "powershell",
+    "ps": "powershell",
+    "csharp": "cs",
+}
+
+def _canon_lang(lang: str) -> str:
+    low = lang.lower()
+    return LANG_ALIASES.get(low, low)
+
+def canonical_langs(allowed: List[str]) -> Optional[frozenset]:
+    """Canonicalize a --lang filter once; None means every block is allowed."""
+    return frozenset(_canon_lang(a) for a in allowed) if allowed else None
+
+def is_allowed_lang(lang: Optional[str], allowed_canon: Optional[frozenset]) -> bool:
+    if allowed_canon is None:
         return True
-    if lang is None:
-        return False
-    aliases = {
-        "py": "python",
-        "ts": "typescript",
-        "js": "javascript",
-        "sh": "bash",
-        "ps1": "powershell",
-        "ps": "powershell",
-        "csharp": "cs",
-    }
-    norm = aliases.get(lang.lower(), lang.lower())
-    canon_allowed = {aliases.get(a.lower(), a.lower()) for a in allowed}
-    return norm in canon_allowed
+    return lang is not None and _canon_lang(lang) in allowed_canon
+
+def _fenced_dest(body: str, marker: str, marker_scan_lines: int) -> Tuple[Optional[str], str]:
+    """
+    Declared destination of a fenced block and the text to write for it:
+    (dest_raw or None, remainder). The marker line or first path line is
+    dropped from the remainder.
+    """
+    if OTHER_LINE_BREAK_RE.search(body):
+        lines = body.splitlines()
+        hit = _marker_path_in_lines(lines, marker, marker_scan_lines)
+        if hit:
+            dest_raw, idx = hit
+            out_lines = lines[:idx] + lines[idx+1:]
+            return dest_raw, "\n".join(out_lines) + ("\n" if body.endswith("\n") else "")
+        first, remainder = _split_first_of_lines(lines, body)
+        return extract_path_from_first_line(first), remainder
+    marker_hit = extract_path_from_marker(body, marker, marker_scan_lines)
+    if marker_hit:
+        dest_raw, line_start, line_end = marker_hit
+        if body[line_end - 1] == "\n":
+            # a body that was only the marker line keeps its trailing newline
+            return dest_raw, body[:line_start] + body[line_end:] or "\n"
+        # marker on the unterminated last line: drop the newline before it too
+        return dest_raw, body[:max(line_start - 1, 0)]
+    first, remainder = split_first_line(body)
+    return extract_path_from_first_line(first), remainder
 
 def process_fenced(md: str, base_dir: Path, allow_outside: bool, overwrite: bool,
                    dry_run: bool, encoding: str, marker: str, marker_scan_lines: int,
-                   lang_filter: List[str], debug: bool, already_written: Set[Path]) -> Tuple[int, int, int]:
+                   lang_filter: List[str], debug: bool, already_written: Set[str],
+                   blocks: Optional[Sequence[Tuple[Optional[str], str, int]]] = None,
+                   created_dirs: Optional[Set[str]] = None,
+                   base_resolved: Optional[str] = None) -> Tuple[int, int, int]:
     wrote = skipped = errored = 0
-    for lang, body, _ in iter_code_blocks(md):
-        if not is_allowed_lang(lang, lang_filter):
+    created_dirs = set() if created_dirs is None else created_dirs
+    if base_resolved is None:
+        base_resolved = os.path.realpath(base_dir)
+    allowed_canon = canonical_langs(lang_filter)
+    for lang, body, _ in (iter_code_blocks(md) if blocks is None else blocks):
+        if not is_allowed_lang(lang, allowed_canon):
             continue
-        lines = body.splitlines()
         dest_raw = None
         remainder = body
         try:
-            marker_hit = extract_path_from_marker(lines, marker, marker_scan_lines)
-            if marker_hit:
-                dest_raw, marker_idx = marker_hit
-                out_lines = lines[:marker_idx] + lines[marker_idx+1:]
-                remainder = "\n".join(out_lines) + ("\n" if body.endswith("\n") else "")
-            else:
-                first, remainder = split_first_line(body)
-                dest_raw = extract_path_from_first_line(first)
+            dest_raw, remainder = _fenced_dest(body, marker, marker_scan_lines)
 
             if not dest_raw:
                 continue  # silent skip if fenced block doesn't declare a path
@@ -386,14 +596,15 @@ def process_fenced(md: str, base_dir: Path, allow_outside: bool, overwrite: bool
             dest_raw = _strip_embedded_hex_prefix(dest_raw)
 
             dest = sanitize_dest_path(dest_raw)
-            out_path = safe_join(base_dir, dest, allow_outside)
+            out_path = safe_join(base_resolved, dest, allow_outside)
 
-            if out_path in already_written:
+            out_key = os.path.normcase(out_path)
+            if out_key in already_written:
                 if debug:
                     print(f"[skip-dup] {out_path}", file=sys.stderr)
                 skipped += 1
                 continue
-            if out_path.exists() and not overwrite:
+            if not overwrite and os.path.exists(out_path):
                 print(f"[skip] {out_path} exists (use --overwrite)", file=sys.stderr)
                 skipped += 1
                 continue
@@ -401,11 +612,11 @@ def process_fenced(md: str, base_dir: Path, allow_outside: bool, overwrite: bool
             if dry_run:
                 print(f"[dry-run] Would write {out_path} ({len(remainder)} bytes)")
             else:
-                out_path.parent.mkdir(parents=True, exist_ok=True)
-                out_path.write_text(remainder, encoding=encoding)
+                _ensure_parent(out_path, created_dirs)
+                _write_text(out_path, remainder, encoding)
                 print(f"[write] {out_path} ({len(remainder)} bytes)")
             wrote += 1
-            already_written.add(out_path)
+            already_written.add(out_key)
 
         except Exception as e:
             errored += 1
@@ -423,37 +634,189 @@ def process_fenced(md: str, base_dir: Path, allow_outside: bool, overwrite: bool
 # Main
 # ---------------------------
 
+# Inputs larger than this are decoded straight from a read-only mmap
+MMAP_MIN_SIZE = 1 << 20
+
+def _read_text(path_str: str, size: int, encoding: str) -> str:
+    """
+    Same result as Path.read_text(), including universal-newline translation.
+    Large files skip the intermediate bytes copy, which lowers peak memory.
+    """
+    if size <= MMAP_MIN_SIZE:
+        return Path(path_str).read_text(encoding=encoding)
+    with open(path_str, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        text = str(mm, encoding)
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+def _scan_markdown(path_str: str, size: int, encoding: str):
+    md = _read_text(path_str, size, encoding)
+    return md, tuple(iter_code_blocks(md)), tuple(iter_hex_headers(md))
+
+# Only pays off when one file is passed more than once (overlapping patterns,
+# or the --jobs planning and writing passes landing on the same worker), so
+# keep it small and never pin large documents for the rest of the run.
+PARSE_CACHE_SIZE = 8
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _scan_markdown_cached(path_str: str, mtime_ns: int, size: int, encoding: str):
+    # mtime_ns is only part of the key: an edited file is re-read
+    return _scan_markdown(path_str, size, encoding)
+
+def _parse_markdown(path_str: str, mtime_ns: int, size: int, encoding: str):
+    """
+    Read and scan one input. Small inputs are cached on (path, mtime, size,
+    encoding) so an unchanged file matched by several glob patterns is only
+    parsed once; inputs above MMAP_MIN_SIZE are never cached.
+    Returns (md, blocks, hex_headers); both sequences are tuples so a cached
+    value cannot be mutated by callers.
+    """
+    if size > MMAP_MIN_SIZE:
+        return _scan_markdown(path_str, size, encoding)
+    return _scan_markdown_cached(path_str, mtime_ns, size, encoding)
+
+def process_file(p: Path, base: Path, args: "argparse.Namespace",
+                 st: Optional[os.stat_result] = None,
+                 base_resolved: Optional[str] = None) -> Tuple[int, int, int]:
+    try:
+        if st is None:
+            st = p.stat()
+        md, blocks, headers = _parse_markdown(str(p), st.st_mtime_ns, st.st_size, args.encoding)
+    except Exception as e:
+        print(f"[error] reading {p}: {e}", file=sys.stderr)
+        return 0, 0, 1
+
+    already_written: Set[str] = set()  # normcase'd output paths
+    created_dirs: Set[str] = set()
+
+    w1, s1, e1 = process_hex_stream(
+        md, base, args.allow_outside, args.overwrite,
+        args.dry_run, args.encoding, args.debug, already_written, headers, created_dirs, base_resolved
+    )
+    w2, s2, e2 = process_fenced(
+        md, base, args.allow_outside, args.overwrite, args.dry_run,
+        args.encoding, args.marker, args.marker_scan_lines,
+        args.lang, args.debug, already_written, blocks, created_dirs, base_resolved
+    )
+    return w1 + w2, s1 + s2, e1 + e2
+
+def _process_file_captured(job: tuple) -> Tuple[int, int, int, str, str]:
+    """
+    --jobs worker: run process_file and hand back its stdout/stderr text so the
+    parent can print each input's messages contiguously and in input order.
+    """
+    out, err = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        w, s, e = process_file(*job)
+    return w, s, e, out.getvalue(), err.getvalue()
+
+def _plan_outputs(job: tuple) -> Set[str]:
+    """
+    --jobs planning pass: the normcase'd output paths process_file would
+    target for one input, without writing or printing anything. Blocks whose
+    destination cannot be resolved are left out (they only report an error).
+    """
+    p, base, args, st, base_resolved = job
+    try:
+        _, blocks, headers = _parse_markdown(str(p), st.st_mtime_ns, st.st_size, args.encoding)
+    except Exception:
+        return set()
+    keys: Set[str] = set()
+    for dest_raw, _, _ in headers:
+        try:
+            keys.add(os.path.normcase(safe_join(base_resolved, sanitize_dest_path(dest_raw), args.allow_outside)))
+        except Exception:
+            pass
+    allowed_canon = canonical_langs(args.lang)
+    for lang, body, _ in blocks:
+        if not is_allowed_lang(lang, allowed_canon):
+            continue
+        try:
+            dest_raw, _ = _fenced_dest(body, args.marker, args.marker_scan_lines)
+            if dest_raw:
+                dest = sanitize_dest_path(_strip_embedded_hex_prefix(dest_raw))
+                keys.add(os.path.normcase(safe_join(base_resolved, dest, args.allow_outside)))
+        except Exception:
+            pass
+    return keys
+
+def _inputs_independent(jobs: List[tuple], plans: List[Set[str]]) -> bool:
+    """
+    True when no two inputs target the same output path and no input is the
+    output of another, i.e. the processing order cannot change the result.
+    """
+    seen: Set[str] = {os.path.normcase(os.path.realpath(job[0])) for job in jobs}
+    for keys in plans:
+        if not seen.isdisjoint(keys):
+            return False
+        seen |= keys
+    return True
+
+def _run_parallel(ex, jobs: List[tuple]) -> Tuple[int, int, int]:
+    """Process independent inputs in the pool, printing their messages in input order."""
+    wrote = skipped = errored = 0
+    for w, s, e, out, err in ex.map(_process_file_captured, jobs):
+        sys.stdout.write(out)
+        sys.stderr.write(err)
+        wrote += w; skipped += s; errored += e
+    return wrote, skipped, errored
+
+def _run_sequential(pattern: str, base: Path, args: "argparse.Namespace",
+                    base_resolved: str) -> Tuple[int, int, int]:
+    wrote = skipped = errored = 0
+    for p, st in iter_input_files(pattern):
+        w, s, e = process_file(p, base, args, st, base_resolved)
+        wrote += w; skipped += s; errored += e
+    return wrote, skipped, errored
+
+# pathlib's glob matches dotfiles too; glob.iglob only does so when asked (3.11+)
+_GLOB_KWARGS = {"recursive": True, "include_hidden": True} if sys.version_info >= (3, 11) else {"recursive": True}
+
+def _glob_sort_key(name: str) -> List[str]:
+    # order like sorted(Path().glob(...)): component-wise, case-folded where the OS is
+    return os.path.normcase(name).split(os.sep)
+
+def iter_input_files(pattern: str):
+    """
+    Yield (path, stat) for each regular file matching `pattern`. One os.stat()
+    per candidate serves both the is-file test and the parse cache key.
+    """
+    for name in sorted(glob.iglob(pattern, **_GLOB_KWARGS), key=_glob_sort_key):
+        try:
+            st = os.stat(name)
+        except OSError:
+            continue
+        if stat.S_ISREG(st.st_mode):
+            yield Path(name), st
+
 def main() -> None:
     args = parse_args()
     base = Path(args.base_dir)
     base.mkdir(parents=True, exist_ok=True)
+    base_resolved = os.path.realpath(base)  # once per run, not per input or block
 
     total_wrote = total_skipped = total_errors = 0
 
-    for pattern in args.inputs:
-        for p in sorted(Path().glob(pattern)):
-            if not p.is_file():
-                continue
-            try:
-                md = p.read_text(encoding=args.encoding)
-            except Exception as e:
-                total_errors += 1
-                print(f"[error] reading {p}: {e}", file=sys.stderr)
-                continue
-
-            already_written: Set[Path] = set()
-
-            w, s, e = process_hex_stream(
-                md, base, args.allow_outside, args.overwrite,
-                args.dry_run, args.encoding, args.debug, already_written
-            )
-            total_wrote += w; total_skipped += s; total_errors += e
-
-            w, s, e = process_fenced(
-                md, base, args.allow_outside, args.overwrite, args.dry_run,
-                args.encoding, args.marker, args.marker_scan_lines,
-                args.lang, args.debug, already_written
-            )
+    if args.jobs > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=args.jobs) as ex:
+            # one batch per pattern: like the sequential loop, a pattern is only
+            # expanded once the inputs of earlier patterns have been written
+            for pattern in args.inputs:
+                jobs = [(p, base, args, st, base_resolved) for p, st in iter_input_files(pattern)]
+                # Dry runs write nothing, so order cannot matter. Otherwise plan the
+                # outputs first; inputs that interact run sequentially, so --jobs
+                # never changes what is written or printed.
+                if args.dry_run or _inputs_independent(jobs, list(ex.map(_plan_outputs, jobs))):
+                    w, s, e = _run_parallel(ex, jobs)
+                else:
+                    w, s, e = _run_sequential(pattern, base, args, base_resolved)
+                total_wrote += w; total_skipped += s; total_errors += e
+    else:
+        for pattern in args.inputs:
+            w, s, e = _run_sequential(pattern, base, args, base_resolved)
             total_wrote += w; total_skipped += s; total_errors += e
 
     if total_wrote == 0 and total_skipped == 0 and total_errors == 0:
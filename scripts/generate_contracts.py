@@ -12,10 +12,10 @@ Deps:
 """
 
 from __future__ import annotations
-import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 import re
-import textwrap
 
 # --- TOML loader --------------------------------------------------------------
 try:
@@ -102,36 +102,48 @@ def iter_components(model: dict):
         yield norm_component(c)
 
 
-# --- Structurizr DSL ----------------------------------------------------------
-def to_structurizr(model: dict) -> str:
-    system = model.get("system", "System")
-    components = list(iter_components(model))
-
-    def container_line(c):
-        name = c["name"]
-        layer = c.get("layer", "component")
-        tech = c.get("package", c.get("layer", ""))
-        return f'      container "{name}" "{tech}" "{layer}"\n'
-
-    rels = []
+# --- Relations (shared by Structurizr + PlantUML) -----------------------------
+def _compute_relations(components: list[dict], model: dict) -> list[tuple[str, str, str]]:
+    """
+    Relations from consumes (http_from, command queues) and flow steps,
+    de-duplicated and in first-seen order.
+    """
+    rels = {}
 
     # relationships from consumes/provides
     for c in components:
         src = c["name"]
-        consumes = c.get("consumes", {})
-        if isinstance(consumes, dict) and "http_from" in consumes:
-            rels.append((consumes["http_from"], src, "calls"))
+        consumes = c.get("consumes", {}) or {}
+        if "http_from" in consumes:
+            rels[(consumes["http_from"], src, "calls")] = None
         # queues/events
         for q in consumes.get("commands", []) or []:
             qname = q.get("queue") or q.get("topic") or "queue"
-            rels.append((src, qname, "consumes"))
+            rels[(src, qname, "consumes")] = None
 
     # infer from flows
     for flow in model.get("flows", []) or []:
         for s in flow.get("steps", []) or []:
             a, b = s.get("from"), s.get("to")
             if a and b:
-                rels.append((a, b, s.get("note", "")))
+                rels[(a, b, s.get("note", "") or "")] = None
+
+    return list(rels)
+
+
+# --- Structurizr DSL ----------------------------------------------------------
+def to_structurizr(model: dict, components: list[dict] | None = None, rels: list[tuple] | None = None) -> str:
+    system = model.get("system", "System")
+    if components is None:
+        components = list(iter_components(model))
+    if rels is None:
+        rels = _compute_relations(components, model)
+
+    def container_line(c):
+        name = c["name"]
+        layer = c.get("layer", "component")
+        tech = c.get("package", c.get("layer", ""))
+        return f'      container "{name}" "{tech}" "{layer}"\n'
 
     # Build DSL
     out = []
@@ -141,16 +153,11 @@ def to_structurizr(model: dict) -> str:
     out.append(f'    softwareSystem "{system}" {{\n')
     for c in components:
         out.append(container_line(c))
-    seen = set()
     for a, b, label in rels:
-        key = (a, b, label or "")
-        if key in seen:
-            continue
-        seen.add(key)
         if a == USER:
-            out.append(f'      User -> "{b}" "{label or ""}"\n')
+            out.append(f'      User -> "{b}" "{label}"\n')
         else:
-            out.append(f'      "{a}" -> "{b}" "{label or ""}"\n')
+            out.append(f'      "{a}" -> "{b}" "{label}"\n')
     out.append("    }\n")
     out.append("  }\n")
     out.append("  views {\n")
@@ -162,6 +169,14 @@ def to_structurizr(model: dict) -> str:
 
 
 # --- Mermaid sequences --------------------------------------------------------
+_NON_WORD_SUB = re.compile(r"\W+").sub
+
+
+@lru_cache(maxsize=None)
+def _mermaid_alias(name: str) -> str:
+    return _NON_WORD_SUB("", name)[:12]
+
+
 def to_mermaid_sequences(model: dict) -> dict[str, str]:
     diagrams = {}
     for flow in model.get("flows", []) or []:
@@ -179,15 +194,15 @@ def to_mermaid_sequences(model: dict) -> dict[str, str]:
             if p == USER:
                 lines.append("  actor User\n")
             else:
-                alias = re.sub(r"\W+", "", p)[:12] or "X"
+                alias = _mermaid_alias(p) or "X"
                 lines.append(f"  participant {alias} as {p}\n")
 
         for s in steps:
             a, b, note = s.get("from"), s.get("to"), s.get("note", "")
             if not a or not b:
                 continue
-            a_alias = "User" if a == USER else re.sub(r"\W+", "", a)[:12]
-            b_alias = "User" if b == USER else re.sub(r"\W+", "", b)[:12]
+            a_alias = "User" if a == USER else _mermaid_alias(a)
+            b_alias = "User" if b == USER else _mermaid_alias(b)
             lines.append(f"  {a_alias}->>{b_alias}: {note}\n")
 
         diagrams[name] = "".join(lines)
@@ -269,9 +284,10 @@ def component_markdown(c: dict) -> str:
 
 
 # --- Import Linter config -----------------------------------------------------
-def to_import_linter(model: dict) -> str:
+def to_import_linter(model: dict, components: list[dict] | None = None) -> str:
     layers = model.get("layers", [])
-    components = list(iter_components(model))
+    if components is None:
+        components = list(iter_components(model))
 
     ordered = ",\n    ".join(l.get("pkg", l.get("name", "")) for l in layers)
 
@@ -333,30 +349,28 @@ THEMES = {
 }
 
 
+_PID_SUB = re.compile(r"[^A-Za-z0-9_]").sub
+_PID_COLLAPSE = re.compile(r"_+").sub
+
+
+@lru_cache(maxsize=None)
 def _pid(name: str) -> str:
-    s = re.sub(r"[^A-Za-z0-9_]", "_", name)
-    s = re.sub(r"_+", "_", s).strip("_")
+    s = _PID_SUB("_", name)
+    s = _PID_COLLAPSE("_", s).strip("_")
     return (s or "X")[:24]
 
 
-def to_plain_plantuml(model: dict, theme: str = "dark") -> str:
+def to_plain_plantuml(
+    model: dict,
+    theme: str = "dark",
+    comps: list[dict] | None = None,
+    rels: list[tuple] | None = None,
+) -> str:
     system = model.get("system", "System")
-    comps = list(iter_components(model))
-
-    # collect relations like DSL
-    rels = set()
-    for c in comps:
-        src = c["name"]
-        cons = c.get("consumes", {}) or {}
-        if "http_from" in cons:
-            rels.add((cons["http_from"], src, "calls"))
-        for q in cons.get("commands", []) or []:
-            rels.add((src, q.get("queue", "queue"), "consumes"))
-    for f in model.get("flows", []) or []:
-        for s in f.get("steps", []) or []:
-            a, b = s.get("from"), s.get("to")
-            if a and b:
-                rels.add((a, b, s.get("note", "")))
+    if comps is None:
+        comps = list(iter_components(model))
+    if rels is None:
+        rels = _compute_relations(comps, model)
 
     out = []
     out.append("@startuml\n")
@@ -382,28 +396,50 @@ def to_plain_plantuml(model: dict, theme: str = "dark") -> str:
     return "".join(out)
 
 
+# --- Output writing -----------------------------------------------------------
+def _write_text(path: Path, content: str) -> None:
+    path.write_text(content, encoding="utf-8")
+
+
+def write_outputs(outputs: dict[Path, str], max_workers: int = 8) -> None:
+    """
+    Write all generated files concurrently (I/O-bound; the GIL is released
+    during the syscalls). Keyed by path, so a name generated twice keeps the
+    last content, as sequential writes did.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        # list() drains the iterator so a failed write raises here
+        list(ex.map(_write_text, outputs.keys(), outputs.values()))
+
+
 # --- main ---------------------------------------------------------------------
 def main():
     ensure_dirs()
     model = load_model()
 
+    # normalize components and derive relations once; every generator reuses them
+    components = list(iter_components(model))
+    rels = _compute_relations(components, model)
+
+    outputs: dict[Path, str] = {}
+
     # 1) Structurizr
-    (C4_DIR / "structurizr.dsl").write_text(to_structurizr(model), encoding="utf-8")
+    outputs[C4_DIR / "structurizr.dsl"] = to_structurizr(model, components, rels)
 
     # 2) Mermaid
     for name, mmd in to_mermaid_sequences(model).items():
-        (MM_DIR / f"{name}.mmd").write_text(mmd, encoding="utf-8")
+        outputs[MM_DIR / f"{name}.mmd"] = mmd
 
     # 3) Component docs
-    for c in iter_components(model):
-        (COMP_DIR / f"{c['name']}.md").write_text(component_markdown(c), encoding="utf-8")
+    for c in components:
+        outputs[COMP_DIR / f"{c['name']}.md"] = component_markdown(c)
 
     # 4) Import Linter config
-    (ARCH_DIR / "importlinter.ini").write_text(to_import_linter(model), encoding="utf-8")
+    outputs[ARCH_DIR / "importlinter.ini"] = to_import_linter(model, components)
 
     # 5) Plain PlantUML (dark + light)
-    (C4_DIR / "c4_plain_dark.puml").write_text(to_plain_plantuml(model, "dark"), encoding="utf-8")
-    (C4_DIR / "c4_plain_light.puml").write_text(to_plain_plantuml(model, "light"), encoding="utf-8")
+    outputs[C4_DIR / "c4_plain_dark.puml"] = to_plain_plantuml(model, "dark", components, rels)
+    outputs[C4_DIR / "c4_plain_light.puml"] = to_plain_plantuml(model, "light", components, rels)
 
     # 6) Root docs index
     index_md = [f"# {model.get('system', 'System')} — Architecture\n\n"]
@@ -415,7 +451,9 @@ def main():
     for flow in model.get("flows", []) or []:
         nm = flow.get("name")
         index_md.append(f"- {nm} (Mermaid): ./diagrams/mermaid/{nm}.mmd\n")
-    (DOCS / "index.md").write_text("".join(index_md), encoding="utf-8")
+    outputs[DOCS / "index.md"] = "".join(index_md)
+
+    write_outputs(outputs)
 
     print("Generated: Structurizr DSL, Mermaid flows, component docs, importlinter.ini, PlantUML (dark+light)")
 
@@ -1,10 +1,12 @@
 import base64
+import time
 from typing import Any, Dict, List
 
 import pytest
 
 from components.ingestionservice.contracts import (
     CreateIngestionRequest,
+    EventLog,
     IngestionStatus,
 )
 from components.ingestionservice.ports import BlobStorageAdapterPort, IndexerPort, MetadataServicePort
@@ -101,3 +103,64 @@ def test_create_ingestion_empty_payload_fails():
         svc.create_ingestion(CreateIngestionRequest())
 
 
+def test_event_log_preserves_order_and_timestamps():
+    log = EventLog()
+    log.append("a", "first", 1.5)
+    log.append("b", "second", 2.25, {"k": 1})
+    log.append("c", "third", 2.25)
+
+    events = list(log)
+    assert len(log) == 3
+    assert [ev.type for ev in events] == ["a", "b", "c"]
+    assert [ev.message for ev in events] == ["first", "second", "third"]
+    assert [ev.ts for ev in events] == [1.5, 2.25, 2.25]
+    assert events[1].data == {"k": 1}
+    assert events[0].data == {}
+
+
+class SlowIndexer(FakeIndexer):
+    def create_job(self, tenant_id: str, items: List[Dict[str, Any]]) -> str:
+        time.sleep(0.02)
+        return super().create_job(tenant_id, items)
+
+
+def test_create_ingestion_events_are_ordered_and_timestamped_now():
+    repo = InMemoryIngestionRepo()
+    svc = IngestionService(tenant_id="t-1", repo=repo, blob=FakeBlob(), meta=FakeMeta(), indexer=SlowIndexer())
+    req = CreateIngestionRequest(
+        files=[{"filename": "a.txt", "bytes_b64": base64.b64encode(b"x").decode("ascii")}]
+    )
+
+    before = time.time()
+    job = svc.create_ingestion(req)
+    after = time.time()
+
+    assert [ev.type for ev in job.events] == [
+        "job.created",
+        "job.running",
+        "file.ingested",
+        "indexer.submitted",
+    ]
+    stamps = [ev.ts for ev in job.events]
+    assert before <= job.created_at <= stamps[0]
+    assert stamps == sorted(stamps)  # never decrease
+    assert stamps[-1] <= after + 1e-3
+    assert job.updated_at == stamps[-1]
+    # the indexer call took 20 ms: the last event is stamped after it
+    assert stamps[-1] - job.created_at >= 0.02
+    assert [ev.type for ev in repo.list_events("t-1", job.id)] == [ev.type for ev in job.events]
+
+
+def test_job_copy_does_not_share_event_log():
+    repo = InMemoryIngestionRepo()
+    job = repo.create_job("t-1")
+    repo.append_event(job, "job.created", "created")
+
+    shallow = job.model_copy()
+    deep = job.model_copy(deep=True)
+    repo.append_event(job, "job.running", "running")
+    shallow.event_log.append("copy.only", "copy", 0.0)
+
+    assert [ev.type for ev in job.events] == ["job.created", "job.running"]
+    assert [ev.type for ev in shallow.events] == ["job.created", "copy.only"]
+    assert [ev.type for ev in deep.events] == ["job.created"]
@@ -0,0 +1,223 @@
+import os
+import random
+import re
+import subprocess
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+import md_generator
+
+SCRIPT = Path(md_generator.__file__).resolve()
+
+# The regex iter_code_blocks replaced; kept here as the reference behaviour.
+FENCE_RE = re.compile(
+    r"(?:^|\n)"
+    r"(?P<indent>[ \t]{0,3})"
+    r"(?P<fence>```+|~~~+)[ \t]*"
+    r"(?P<info>[^\n]*)\n"
+    r"(?P<body>.*?)(?:\n)"
+    r"(?P=indent)(?P=fence)[ \t]*"
+    r"(?=\n|$)",
+    re.DOTALL,
+)
+
+# The regex iter_hex_headers replaced.
+HEX_HEADER_RE = re.compile(
+    rf"^[ \t]*{md_generator.FILESTART_HEX}[ \t]+(?P<path>\S+)[ \t]*$", re.MULTILINE
+)
+
+
+def _regex_blocks(md):
+    out = []
+    for m in FENCE_RE.finditer(md):
+        info = (m.group("info") or "").strip()
+        out.append((info.split()[0] if info else None, m.group("body"), m.start()))
+    return out
+
+
+# ---- fenced blocks ----
+@pytest.mark.parametrize("md", [
+    "```py\nx = 1\n```\n",
+    "~~~js\nlet a;\n~~~\n",
+    "intro\n```\nno lang\n```",
+    "```py extra info\na\nb\n```\ntrailing text\n",
+    "   ```py\nindented opener and closer\n   ```\n",
+    "    ```py\nfour spaces is not a fence\n    ```\n",
+    "````md\n```py\ninner\n```\n````\n",
+    "````\nlonger opener, shorter closer\n```\n",
+    "```\nshorter opener\n````\nstill open\n```\n",
+    "```py\nunterminated\n",
+    "~~~\nmixed closer\n```\n~~~\n",
+    "```py\n```\n",
+    "```py\n\n```\n",
+    "```a\n1\n```\n```b\n2\n```\n",
+    "```py\nx\n```   \nclose with trailing blanks\n",
+    "text ```py\nnot at line start\n```\n",
+])
+def test_iter_code_blocks_matches_fence_regex(md):
+    assert list(md_generator.iter_code_blocks(md)) == _regex_blocks(md)
+
+
+def test_iter_code_blocks_matches_fence_regex_randomized():
+    rnd = random.Random(1234)
+    pieces = ["```", "````", "~~~", "~~~~", "py", " js", "  ", " ", "\t", "x", "code", "\n", "\n", "\n"]
+    for _ in range(3000):
+        md = "".join(rnd.choice(pieces) for _ in range(rnd.randint(0, 30)))
+        assert list(md_generator.iter_code_blocks(md)) == _regex_blocks(md), repr(md)
+
+
+# ---- hex headers ----
+HEX = md_generator.FILESTART_HEX
+
+
+@pytest.mark.parametrize("md", [
+    f"{HEX} a/b.py\nbody\n",
+    f"  {HEX}\tsrc/x.txt  \nbody\n{HEX} y.txt",
+    f"{HEX}a.py\n",
+    f"{HEX} two tokens\n",
+    f"{HEX} \n",
+    f"text {HEX} a.py\n",
+    f"{HEX} {HEX}\n{HEX} ok.py\n",
+    f"{HEX} a.py\r\n",
+    f"{HEX}{HEX} a.py\n",
+])
+def test_iter_hex_headers_matches_header_regex(md):
+    expected = [(m.group("path"), m.start(), m.end()) for m in HEX_HEADER_RE.finditer(md)]
+    assert list(md_generator.iter_hex_headers(md)) == expected
+
+
+def test_iter_hex_headers_matches_header_regex_randomized():
+    rnd = random.Random(99)
+    pieces = [HEX, HEX, " ", "\t", "a.py", "x/y", "\n", "\n", "\r", "\u00a0", "z"]
+    for _ in range(3000):
+        md = "".join(rnd.choice(pieces) for _ in range(rnd.randint(0, 14)))
+        expected = [(m.group("path"), m.start(), m.end()) for m in HEX_HEADER_RE.finditer(md)]
+        assert list(md_generator.iter_hex_headers(md)) == expected, repr(md)
+
+
+# ---- splitlines() boundaries other than "\n" ----
+@pytest.mark.parametrize("body, dest, remainder, first", [
+    ("# *&^file a.py\r\nx = 1\r\n", "a.py", "x = 1\n", "# *&^file a.py"),
+    ("x = 1\r\n# *&^file a.py\r\n", None, "# *&^file a.py\n", "x = 1"),
+    ("\r\n# b.py\r\ny = 2\r\n", "b.py", "y = 2\n", "# b.py"),
+    ("# *&^file a.py\x0cx = 1\n", "a.py", "x = 1\n", "# *&^file a.py"),
+    (" # c.py z\n", "c.py", "z\n", "# c.py"),
+    ("# a.py\x85w", "a.py", "w", "# a.py"),
+])
+def test_fenced_dest_keeps_splitlines_semantics(body, dest, remainder, first):
+    assert md_generator._fenced_dest(body, "*&^file", 10) == (dest, remainder)
+    assert md_generator.split_first_line(body)[0] == first
+
+
+def test_process_hex_stream_splits_bodies_between_headers(tmp_path):
+    md = f"{HEX} one.txt\nfirst\n```\n{HEX} sub/two.txt\nsecond\n"
+    wrote, skipped, errored = md_generator.process_hex_stream(
+        md, tmp_path, False, False, False, "utf-8", False, set()
+    )
+    assert (wrote, skipped, errored) == (2, 0, 0)
+    assert (tmp_path / "one.txt").read_text(encoding="utf-8") == "first\n"
+    assert (tmp_path / "sub" / "two.txt").read_text(encoding="utf-8") == "second\n"
+
+
+# ---- parse cache ----
+def test_parse_cache_reuses_small_inputs_and_skips_large_ones(tmp_path, monkeypatch):
+    small = tmp_path / "small.md"
+    small.write_text("```py\n# a.py\nx = 1\n```\n", encoding="utf-8")
+    large = tmp_path / "large.md"
+    large.write_text("```py\n# b.py\n" + "y = 2\n" * 50 + "```\n", encoding="utf-8")
+    monkeypatch.setattr(md_generator, "MMAP_MIN_SIZE", 64)
+    md_generator._scan_markdown_cached.cache_clear()
+
+    def parse(p):
+        st = p.stat()
+        return md_generator._parse_markdown(str(p), st.st_mtime_ns, st.st_size, "utf-8")
+
+    assert parse(small) is parse(small)
+    first = parse(large)
+    assert parse(large) is not first and parse(large) == first
+    info = md_generator._scan_markdown_cached.cache_info()
+    assert (info.hits, info.currsize) == (1, 1)
+    assert info.maxsize == md_generator.PARSE_CACHE_SIZE
+
+
+# ---- --jobs ----
+def _run_cli(root: Path, *extra: str):
+    res = subprocess.run(
+        [sys.executable, str(SCRIPT), "in/*.md", "--base-dir", "out", *extra],
+        cwd=root, capture_output=True, text=True, check=True,
+    )
+    files = {
+        str(p.relative_to(root)): p.read_bytes()
+        for p in sorted(root.rglob("*")) if p.is_file()
+    }
+    return res.stdout.replace(str(root), "ROOT"), res.stderr.replace(str(root), "ROOT"), files
+
+
+def _make_inputs(root: Path, docs):
+    (root / "in").mkdir(parents=True)
+    for name, text in docs.items():
+        (root / "in" / name).write_text(text, encoding="utf-8")
+
+
+def test_jobs_matches_sequential_when_inputs_share_a_destination(tmp_path):
+    docs = {
+        f"doc{i}.md": f"```py\n# shared.py\nprint({i})\n```\n```py\n# own{i}.py\nx = {i}\n```\n"
+        for i in range(24)
+    }
+    for extra in ((), ("--overwrite",)):
+        seq, par = tmp_path / f"seq{len(extra)}", tmp_path / f"par{len(extra)}"
+        _make_inputs(seq, docs)
+        _make_inputs(par, docs)
+        assert _run_cli(par, "--jobs", "3", *extra) == _run_cli(seq, *extra)
+
+
+def test_jobs_matches_sequential_for_independent_inputs(tmp_path):
+    docs = {f"doc{i}.md": f"```py\n# pkg/mod{i}.py\nprint({i})\n```\n" for i in range(6)}
+    seq, par = tmp_path / "seq", tmp_path / "par"
+    _make_inputs(seq, docs)
+    _make_inputs(par, docs)
+    assert _run_cli(par, "--jobs", "3") == _run_cli(seq)
+
+
+def _jobs_for(root: Path, base: Path):
+    args = SimpleNamespace(encoding="utf-8", allow_outside=False, lang=[], marker="*&^file", marker_scan_lines=10)
+    base_resolved = os.path.realpath(base)
+    return [
+        (p, base, args, st, base_resolved)
+        for p, st in md_generator.iter_input_files(str(root / "in" / "*.md"))
+    ]
+
+
+def test_plan_outputs_lists_hex_and_fenced_destinations(tmp_path):
+    _make_inputs(tmp_path, {
+        "a.md": "66696c657374617274 hex/one.txt\nbody\n```py\n# pkg/two.py\nx = 1\n```\n```\nno path here\n```\n",
+    })
+    base = tmp_path / "out"
+    (job,) = _jobs_for(tmp_path, base)
+    expected = {os.path.normcase(os.path.realpath(base / rel)) for rel in ("hex/one.txt", "pkg/two.py")}
+    assert md_generator._plan_outputs(job) == expected
+    assert not base.exists()  # planning writes nothing
+
+
+def test_inputs_independent_detects_shared_and_input_destinations(tmp_path):
+    _make_inputs(tmp_path, {
+        "a.md": "```py\n# a.py\n```\n",
+        "b.md": "```py\n# b.py\n```\n",
+    })
+    jobs = _jobs_for(tmp_path, tmp_path / "out")
+    plans = [md_generator._plan_outputs(job) for job in jobs]
+    assert md_generator._inputs_independent(jobs, plans)
+
+    (tmp_path / "in" / "b.md").write_text("```py\n# a.py\n```\n", encoding="utf-8")
+    jobs = _jobs_for(tmp_path, tmp_path / "out")
+    plans = [md_generator._plan_outputs(job) for job in jobs]
+    assert not md_generator._inputs_independent(jobs, plans)
+
+    # an input that another input would overwrite
+    (tmp_path / "in" / "b.md").write_text("```py\n# in/a.md\n```\n", encoding="utf-8")
+    jobs = _jobs_for(tmp_path, tmp_path)
+    plans = [md_generator._plan_outputs(job) for job in jobs]
+    assert not md_generator._inputs_independent(jobs, plans)
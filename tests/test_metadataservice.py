@@ -70,16 +70,3 @@ def test_error_blob_not_found():
     assert res.status_code == 404
     body = res.json()
     assert body["detail"]["code"] == "metadata.blob_not_found"
-
----
-
-### Notes & next step options
-
-* This iteration is self-contained and testable (in-memory).
-* When you’re ready, we can wire real adapters:
-
-  * **BlobReaderPort** → your BlobStorageAdapter (S3/GCS/Azure/local).
-  * **LLMAdapterPort** → your existing LLMAdapter (model + prompts).
-  * **MetadataStorePort** → Postgres via SQLAlchemy + Alembic.
-
-If you want me to immediately add the Postgres adapter (models + alembic migration + repo + DI), say the word and I’ll ship the full files in the same style.
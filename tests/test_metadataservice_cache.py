@@ -0,0 +1,96 @@
+from components.metadataservice.service import (
+    Dependencies,
+    InMemoryResultCache,
+    NoopLLMAdapter,
+    SimpleKeywordExtractor,
+    build_record,
+)
+
+
+TEXT = "Contract Agreement between Parties A and B.\nInvoice amount due: 1000 EUR.\n"
+
+
+class CountingLLM(NoopLLMAdapter):
+    def __init__(self):
+        self.calls = 0
+
+    def extract_summary_and_categories(self, text, tenant_id, max_labels=5):
+        self.calls += 1
+        return super().extract_summary_and_categories(text, tenant_id, max_labels=max_labels)
+
+
+def _build(cache, llm, text=TEXT, top_k=5, source_id="doc-1"):
+    return build_record(
+        text=text,
+        raw=None,
+        tenant_id="t1",
+        source_id=source_id,
+        keyword_extractor=SimpleKeywordExtractor(),
+        llm=llm,
+        llm_enabled=True,
+        top_k=top_k,
+        cache=cache,
+    )
+
+
+def test_cache_miss_then_hit_skips_llm():
+    cache = InMemoryResultCache()
+    llm = CountingLLM()
+
+    first = _build(cache, llm)
+    second = _build(cache, llm, source_id="doc-2")
+
+    assert llm.calls == 1
+    assert second.metadata_id != first.metadata_id
+    assert second.source_id == "doc-2"
+    assert second.keywords == first.keywords
+    assert second.summary == first.summary
+    assert second.categories == first.categories
+
+
+def test_cache_key_includes_content_and_top_k():
+    cache = InMemoryResultCache()
+    llm = CountingLLM()
+
+    _build(cache, llm)
+    _build(cache, llm, top_k=3)
+    _build(cache, llm, text=TEXT + "Meeting notes.\n")
+
+    assert llm.calls == 3
+
+
+def test_cache_hits_do_not_share_mutable_state():
+    cache = InMemoryResultCache()
+    llm = CountingLLM()
+
+    first = _build(cache, llm)
+    expected_keywords = list(first.keywords)
+    expected_categories = list(first.categories)
+    first.keywords.append("mutated")
+    first.categories.append("mutated")
+
+    hit1 = _build(cache, llm)
+    hit1.keywords.clear()
+    hit1.categories.clear()
+    hit2 = _build(cache, llm)
+
+    assert llm.calls == 1
+    assert hit2.keywords == expected_keywords
+    assert hit2.categories == expected_categories
+    assert hit2.keywords is not hit1.keywords
+
+
+def test_cache_is_opt_in():
+    assert Dependencies().cache is None
+
+
+def test_two_call_adapters_still_work():
+    class TwoCallLLM:
+        def summarize(self, text, tenant_id):
+            return "s"
+
+        def categorize(self, text, tenant_id, max_labels=5):
+            return ["c"]
+
+    record = _build(None, TwoCallLLM())
+    assert (record.summary, record.categories) == ("s", ["c"])
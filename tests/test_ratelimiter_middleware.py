@@ -63,4 +63,18 @@ async def test_middleware_basic_flow():
         # advance time → allow again
         t["now"] += 1.0
         r4 = await ac.get("/echo")
-        assert r4.status_code == 200
\ No newline at end of file
+        assert r4.status_code == 200
+
+def test_policy_index_matches_linear_scan_order():
+    from components.ratelimiter.middleware import _PolicyIndex
+
+    patterns = [r"^/api/v1/", r"^/api/", r"^/ab?c", r".*x", r"^/a|/b", r"^/api/v1/users$", r"^"]
+    policies = [
+        Policy(name=f"p{i}", rate=1, period=1, burst=1, path_pattern=pat, methods=["GET"] if i % 2 else None)
+        for i, pat in enumerate(patterns)
+    ]
+    index = _PolicyIndex(policies)
+    for path in ["/api/v1/users", "/api/x", "/ac", "/abc", "/b", "/zx", "/q", ""]:
+        for method in ("GET", "POST"):
+            expected = next((p for p in policies if p.matches(method, path)), None)
+            assert index.select(method, path) is expected
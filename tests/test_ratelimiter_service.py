@@ -32,7 +32,7 @@ def test_token_bucket_basic_allow_and_deny():
 
     r3 = svc.consume("global:*", policy, cost=1)
     assert not r3.allowed
-    assert r3.retry_after == 1  # need ~0.5s for 1 token at 2/s → ceil → 1
+    assert math.isclose(r3.retry_after, 0.5)  # need 0.5s for 1 token at 2/s
 
     # advance 0.5s → should still ceil to 1 if we recheck immediately
     advance(0.5)
@@ -68,4 +68,49 @@ def test_leaky_bucket_deny_then_allow_after_drain():
     # Advance time to drain enough for 1
     advance(1.0)  # drains 2 tokens per second → level should drop to 0
     r4 = svc.consume("k", policy, 1)
-    assert r4.allowed
\ No newline at end of file
+    assert r4.allowed
+
+def make_ns_clock(start=0):
+    t = {"now": int(start)}
+    def now_ns():
+        return t["now"]
+    def advance_ns(dt):
+        t["now"] += int(dt)
+    return now_ns, advance_ns
+
+def test_token_bucket_carries_fractional_refill_across_many_calls():
+    now_ns, advance_ns = make_ns_clock()
+    svc = RateLimiterService(store=InMemoryStore(), now_ns=now_ns)
+    # 1 token per 3 s: each 1 ms step refills 333.33... microtokens
+    policy = Policy(name="p3", algorithm="token_bucket", rate=1, period=3, burst=1, scope="global")
+
+    assert svc.consume("k", policy).allowed
+    for _ in range(2999):
+        advance_ns(1_000_000)
+        assert not svc.consume("k", policy).allowed
+    # exactly 3 s elapsed: no refill lost to truncation along the way
+    advance_ns(1_000_000)
+    r = svc.consume("k", policy)
+    assert r.allowed and r.remaining == 0.0
+
+def test_token_bucket_refill_caps_at_burst_and_reports_deficit():
+    now_ns, advance_ns = make_ns_clock()
+    svc = RateLimiterService(store=InMemoryStore(), now_ns=now_ns)
+    policy = Policy(name="p4", algorithm="token_bucket", rate=4, period=2, burst=3, scope="global")
+
+    for expected in (2.0, 1.0, 0.0):
+        r = svc.consume("k", policy)
+        assert r.allowed and r.remaining == expected
+    r = svc.consume("k", policy)
+    assert not r.allowed
+    assert math.isclose(r.retry_after, 0.5)  # 1 token at 2 tokens/s
+
+    advance_ns(250_000_000)  # half a token
+    snap = svc.snapshot("k", policy)
+    r = svc.consume("k", policy)
+    assert not r.allowed and math.isclose(r.retry_after, 0.25)
+    assert snap.tokens == 0.0  # snapshot reads state, it does not refill
+
+    advance_ns(3600 * 1_000_000_000)  # long idle: refill is capped at burst
+    r = svc.consume("k", policy, cost=2)
+    assert r.allowed and r.remaining == 1.0